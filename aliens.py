@@ -1,16 +1,26 @@
-import pygame
 from pygame.sprite import Sprite
 
+import assets
+import fonts
+
 class Aliens(Sprite):
     """base class for all alien types"""
+    color = None
+    point_value = 0
+
+    @classmethod
+    def size(cls):
+        """size of this alien type's sprite, without building one"""
+        return assets.alien_frames(cls.color)[0][0].get_size()
+
     def __init__(self, game, x, y):
         super().__init__()
         self.screen = game.screen
         self.settings = game.settings
         self.game = game
         
-        # Animation states
-        self.frames = []
+        # Animation states, shared with every other alien of this color
+        self.frames, self.explosion_frames = assets.alien_frames(self.color)
         self.current_frame = 0
         self.frame_time = 0
         self.animation_speed = 1000  # milliseconds between frames
@@ -22,11 +32,17 @@ class Aliens(Sprite):
         
         # State
         self.dying = False
-        self.explosion_frames = []
         self.explosion_frame = 0
         self.explosion_time = 0
         self.explosion_speed = 100  # milliseconds between explosion frames
         
+        self.image = self.frames[0]
+        self.rect = self.image.get_rect()
+        self.rect.x = self.x
+        self.rect.y = self.y
+        # Where the alien was at the start of the tick, for interpolation
+        self.prev_rect = self.rect.copy()
+        
     def update(self, time_delta):
         # Handle animation
         self.frame_time += time_delta
@@ -47,9 +63,15 @@ class Aliens(Sprite):
                     self.kill()  # Remove sprite when explosion animation completes
         
         # Update position based on current speed
-        self.x += self.settings.alien_speed * self.speed_factor * self.settings.fleet_direction
+        self.x += (self.settings.alien_speed * self.speed_factor * self.settings.fleet_direction
+                   * self.settings.motion_scale)
         self.rect.x = self.x
     
+    @property
+    def mask(self):
+        """collision mask of the current frame"""
+        return assets.mask(self.image, self.rect.size)
+    
     def check_edges(self):
         screen_rect = self.screen.get_rect()
         if self.rect.right >= screen_rect.right or self.rect.left <= 0:
@@ -64,91 +86,23 @@ class Aliens(Sprite):
             self.explosion_time = 0
             self.image = self.explosion_frames[0]
             # Play explosion sound
-            pygame.mixer.Sound('sounds/alien_explosion.mp3').play()
+            self.game.sounds.play('alien_explosion')
 
 class PinkAlien(Aliens):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
-        # Load the two animation frames
-        self.frames = [
-            pygame.image.load('images/pink_alien_1.png'),
-            pygame.image.load('images/pink_alien_2.png')
-        ]
-        # Load explosion animation frames
-        self.explosion_frames = [
-            pygame.image.load('images/pink_alien_explosion_1.png'),
-            pygame.image.load('images/pink_alien_explosion_2.png'),
-            pygame.image.load('images/pink_alien_explosion_3.png')
-        ]
-        
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect()
-        self.rect.x = self.x
-        self.rect.y = self.y
-        self.point_value = 30
+    color = 'pink'
+    point_value = 30
 
 class BlueAlien(Aliens):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
-        # Load the two animation frames
-        self.frames = [
-            pygame.image.load('images/blue_alien_1.png'),
-            pygame.image.load('images/blue_alien_2.png')
-        ]
-        # Load explosion animation frames
-        self.explosion_frames = [
-            pygame.image.load('images/blue_alien_explosion_1.png'),
-            pygame.image.load('images/blue_alien_explosion_2.png'),
-            pygame.image.load('images/blue_alien_explosion_3.png')
-        ]
-        
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect()
-        self.rect.x = self.x
-        self.rect.y = self.y
-        self.point_value = 20
+    color = 'blue'
+    point_value = 20
 
 class GreenAlien(Aliens):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
-        # Load the two animation frames
-        self.frames = [
-            pygame.image.load('images/green_alien_1.png'),
-            pygame.image.load('images/green_alien_2.png')
-        ]
-        # Load explosion animation frames
-        self.explosion_frames = [
-            pygame.image.load('images/green_alien_explosion_1.png'),
-            pygame.image.load('images/green_alien_explosion_2.png'),
-            pygame.image.load('images/green_alien_explosion_3.png')
-        ]
-        
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect()
-        self.rect.x = self.x
-        self.rect.y = self.y
-        self.point_value = 10
+    color = 'green'
+    point_value = 10
 
 class RedAlien(Aliens):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
-        # Load the two animation frames
-        self.frames = [
-            pygame.image.load('images/red_alien_1.png'),
-            pygame.image.load('images/red_alien_2.png')
-        ]
-        # Load explosion animation frames
-        self.explosion_frames = [
-            pygame.image.load('images/red_alien_explosion_1.png'),
-            pygame.image.load('images/red_alien_explosion_2.png'),
-            pygame.image.load('images/red_alien_explosion_3.png')
-        ]
-        
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect()
-        self.rect.x = self.x
-        self.rect.y = self.y
-        self.point_value = 40
+    color = 'red'
+    point_value = 40
 
 class UFO(Sprite):
     def __init__(self, game):
@@ -158,18 +112,20 @@ class UFO(Sprite):
         self.game = game
         
         # Load the UFO image
-        self.image = pygame.image.load('images/ufo.png')
+        self.image = assets.image('ufo.png')
         self.rect = self.image.get_rect()
         
         # Set starting position (top of screen, off to the left)
-        self.rect.y = 50
+        self.rect.y = self.settings.px(50)
         self.rect.x = -self.rect.width
         
         # Store decimal position
         self.x = float(self.rect.x)
+        self.prev_rect = self.rect.copy()
         
-        # Sound
-        self.sound = pygame.mixer.Sound('sounds/ufo_sound.mp3')
+        # Sound (the looping voice is handed out by the sound bank)
+        self.sounds = game.sounds
+        self.sound_channel = None
         self.sound_playing = False
         
         # Points (random value when destroyed)
@@ -181,15 +137,20 @@ class UFO(Sprite):
         
         # Direction (1 = right, -1 = left)
         self.direction = 1
+    
+    @property
+    def mask(self):
+        """collision mask of the UFO, or of its points once hit"""
+        return assets.mask(self.image, self.rect.size)
         
     def update(self, time_delta):
         # Move the UFO
-        self.x += self.settings.ufo_speed * self.direction
+        self.x += self.settings.ufo_speed * self.direction * self.settings.motion_scale
         self.rect.x = self.x
         
         # Play sound if not already playing
         if not self.sound_playing:
-            self.sound.play(-1)  # Loop indefinitely
+            self.sound_channel = self.sounds.play('ufo_sound', -1)  # Loop indefinitely
             self.sound_playing = True
             
         # Check if UFO has moved off screen
@@ -198,7 +159,7 @@ class UFO(Sprite):
            (self.direction < 0 and self.rect.right < 0):
             self.kill()
             if self.sound_playing:
-                self.sound.stop()
+                self.sounds.stop(self.sound_channel, 'ufo_sound')
                 self.sound_playing = False
         
         # Handle value display if hit
@@ -207,22 +168,21 @@ class UFO(Sprite):
             if self.value_display_time >= self.value_max_time:
                 self.kill()
                 if self.sound_playing:
-                    self.sound.stop()
+                    self.sounds.stop(self.sound_channel, 'ufo_sound')
                     self.sound_playing = False
     
     def hit(self):
         if not self.showing_value:
-            import random
             self.showing_value = True
             self.value_display_time = 0
-            self.point_value = random.choice(self.possible_values)
+            self.point_value = self.game.random.ufo_points.choice(self.possible_values)
             
-            # Create a font to display the value
-            font = pygame.font.SysFont('Arial', 28)
-            self.image = font.render(str(self.point_value), True, (255, 255, 255))
+            # Display the value in place of the UFO
+            self.image = fonts.render(str(self.point_value), 'Arial', self.settings.px(28),
+                                      (255, 255, 255))
             
             # Stop the UFO sound and play explosion
             if self.sound_playing:
-                self.sound.stop()
+                self.sounds.stop(self.sound_channel, 'ufo_sound')
                 self.sound_playing = False
-            pygame.mixer.Sound('sounds/ufo_explosion.mp3').play()
+            self.sounds.play('ufo_explosion')
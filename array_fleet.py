@@ -0,0 +1,351 @@
+"""The alien fleet stored as NumPy arrays (struct of arrays).
+
+Each alien is a row across a set of parallel arrays: position, size, type,
+animation frame and timers, dying state. Movement, edge checks, drops,
+animation are single vectorized operations over every row, so the per-tick
+cost barely grows with the size of the formation.
+
+The arithmetic mirrors Aliens.update exactly (float64 positions, pygame's
+rounding when a float becomes a rect coordinate), so a game played with this
+engine matches the sprite fleet tick for tick.
+"""
+import numpy as np
+import pygame
+
+import assets
+from fleet import FleetGrid, FleetImage
+
+
+def _pygame_round(values):
+    """round half away from zero, as pygame does when setting rect coordinates"""
+    whole = np.trunc(values)
+    # values - whole is exact, so halves are caught exactly
+    return (whole + np.sign(values) * (np.abs(values - whole) >= 0.5)).astype(np.int64)
+
+
+class AlienView:
+    """one alien of an ArrayFleet, looking like an Aliens sprite
+
+    Views are handed out by sprites(), alien() and firing() for
+    code that works with one alien at a time (bots, observations, alien
+    fire). They read the fleet's arrays, so they stay current as it updates.
+    """
+
+    def __init__(self, fleet, alien_id):
+        self.fleet = fleet
+        self.id = alien_id
+
+    @property
+    def index(self):
+        return self.fleet._index(self.id)
+
+    @property
+    def rect(self):
+        return self.fleet._rect(self.index)
+
+    @property
+    def point_value(self):
+        return self.fleet.classes[self.fleet.kind[self.index]].point_value
+
+    @property
+    def dying(self):
+        return bool(self.fleet.dying[self.index])
+
+    @property
+    def image(self):
+        fleet = self.fleet
+        i = self.index
+        return fleet.images[fleet.kind[i]][fleet.image[i]]
+
+    @property
+    def mask(self):
+        return self.fleet._collision_mask(self.id)
+
+    def alive(self):
+        return self.fleet._index(self.id) is not None
+
+    def hit(self):
+        self.fleet.hit(self.index)
+
+    def kill(self):
+        index = self.fleet._index(self.id)
+        if index is not None:
+            self.fleet._remove(np.arange(self.fleet.count) == index)
+
+
+class ArrayFleet:
+    """the fleet as parallel NumPy arrays, one row per alien"""
+
+    animation_speed = 1000  # milliseconds between frames
+    explosion_speed = 100  # milliseconds between explosion frames
+
+    def __init__(self, game, capacity=64):
+        self.game = game
+        self.settings = game.settings
+        self.count = 0
+        self.next_id = 0
+
+        # Alien classes in the fleet; kind is an index into these
+        self.classes = []
+        self.kinds = {}
+        # Alien ids by formation cell
+        self.grid = FleetGrid()
+        # The fleet's layer of the collision world, keyed by alien id
+        self.world = game.collisions
+        self.world.track('aliens', self._collision_rect, mask_of=self._collision_mask)
+        # Per class: movement frames followed by explosion frames
+        self.images = []
+        self.frame_counts = np.zeros(0, dtype=np.int64)
+        self.explosion_counts = np.zeros(0, dtype=np.int64)
+        self.point_values = np.zeros(0, dtype=np.int64)
+        # The fleet drawn as one surface, and the (kind, image, left, top)
+        # rows, relative to the first alien, it was last drawn from
+        self.fleet_image = FleetImage()
+        self.drawn_layout = None
+
+        self._allocate(capacity)
+
+    # Every per-alien array and its type
+    _fields = {
+        'ids': np.int64, 'kind': np.int64, 'row': np.int64, 'column': np.int64,
+        # Exact positions, and the rect coordinates they round to
+        'x': np.float64, 'y': np.float64, 'left': np.int64, 'top': np.int64,
+        'width': np.int64, 'height': np.int64,
+        'prev_left': np.int64, 'prev_top': np.int64,
+        # Animation: image is an index into images[kind]
+        'frame_time': np.float64, 'current_frame': np.int64, 'image': np.int64,
+        'dying': np.bool_, 'explosion_frame': np.int64, 'explosion_time': np.float64,
+    }
+
+    def _allocate(self, capacity):
+        """(re)allocate every array with room for capacity aliens"""
+        for name, dtype in self._fields.items():
+            array = np.zeros(capacity, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:self.count] = old[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def _kind_of(self, alien_class):
+        """(kind, width, height) of an alien class, registering it if it is new"""
+        info = self.kinds.get(alien_class)
+        if info is None:
+            frames, explosion_frames = assets.alien_frames(alien_class.color)
+            self.classes.append(alien_class)
+            self.images.append(list(frames) + list(explosion_frames))
+            self.frame_counts = np.append(self.frame_counts, len(frames))
+            self.explosion_counts = np.append(self.explosion_counts, len(explosion_frames))
+            self.point_values = np.append(self.point_values, alien_class.point_value)
+            info = self.kinds[alien_class] = (len(self.classes) - 1, *alien_class.size())
+        return info
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def add_alien(self, alien_class, x, y, cell):
+        """add an alien at (x, y), in the (row, column) cell of the formation"""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        kind, width, height = self._kind_of(alien_class)
+        self.ids[i] = self.next_id
+        self.kind[i] = kind
+        self.row[i], self.column[i] = cell
+        self.x[i] = x
+        self.y[i] = y
+        # A Rect does the same rounding as Aliens.__init__
+        rect = pygame.Rect(0, 0, width, height)
+        rect.x, rect.y = x, y
+        self.left[i] = self.prev_left[i] = rect.x
+        self.top[i] = self.prev_top[i] = rect.y
+        self.width[i] = width
+        self.height[i] = height
+        # Rows past count may hold a removed alien's state
+        self.frame_time[i] = self.explosion_time[i] = 0
+        self.current_frame[i] = self.image[i] = self.explosion_frame[i] = 0
+        self.dying[i] = False
+        self.grid.add(*cell, self.next_id)
+        self.world.add('aliens', self.next_id, (rect.x, rect.y, width, height))
+        self.next_id += 1
+        self.count += 1
+
+    def empty(self):
+        self.count = 0
+        self.grid.clear()
+        self.world.clear('aliens')
+
+    def _remove(self, mask):
+        """drop the rows where mask is set, keeping the others in order"""
+        keep = ~mask
+        n = self.count
+        for alien_id, row, column in zip(self.ids[:n][mask].tolist(), self.row[:n][mask].tolist(),
+                                         self.column[:n][mask].tolist()):
+            self.grid.remove(row, column)
+            self.world.remove('aliens', alien_id)
+        remaining = int(keep.sum())
+        for name in self._fields:
+            array = getattr(self, name)
+            array[:remaining] = array[:n][keep]
+        self.count = remaining
+
+    def _index(self, alien_id):
+        """row of the alien with this id, or None once it is gone"""
+        # Rows stay in the order they were added, so ids are sorted
+        ids = self.ids[:self.count]
+        i = int(np.searchsorted(ids, alien_id))
+        if i < self.count and ids[i] == alien_id:
+            return i
+        return None
+
+    def _rect(self, i):
+        return pygame.Rect(int(self.left[i]), int(self.top[i]),
+                           int(self.width[i]), int(self.height[i]))
+
+    def sprites(self):
+        """a view of each alien, in the order they were added"""
+        return [AlienView(self, alien_id) for alien_id in self.ids[:self.count].tolist()]
+
+    def update(self, time_delta):
+        """animate and move every alien by one tick (see Aliens.update)"""
+        n = self.count
+        if not n:
+            return
+        kind = self.kind[:n]
+        image = self.image[:n]
+
+        # Movement animation
+        frame_time = self.frame_time[:n]
+        frame_time += time_delta
+        flip = frame_time > self.animation_speed
+        frame_time[flip] = 0
+        current = self.current_frame[:n]
+        current[flip] = (current[flip] + 1) % self.frame_counts[kind[flip]]
+        image[flip] = current[flip]
+
+        # Explosions advance, and finished ones are removed
+        dying = self.dying[:n]
+        explosion_time = self.explosion_time[:n]
+        explosion_time[dying] += time_delta
+        advance = dying & (explosion_time > self.explosion_speed)
+        explosion_time[advance] = 0
+        explosion_frame = self.explosion_frame[:n]
+        more = advance & (explosion_frame < self.explosion_counts[kind] - 1)
+        explosion_frame[more] += 1
+        image[more] = self.frame_counts[kind[more]] + explosion_frame[more]
+
+        # Every alien moves the same distance
+        settings = self.settings
+        self.x[:n] += (settings.alien_speed * 1.0 * settings.fleet_direction
+                       * settings.motion_scale)
+        self.left[:n] = _pygame_round(self.x[:n])
+
+        finished = advance & ~more
+        if finished.any():
+            self._remove(finished)
+
+    def at_edge(self):
+        if not self.count:
+            return False
+        left = self._index(self.grid.leftmost())
+        right = self._index(self.grid.rightmost())
+        return bool(self.left[left] <= 0 or
+                    self.left[right] + self.width[right] >= self.settings.screen_width)
+
+    def extents(self):
+        """(left, right, bottom) of the fleet, or None if it is empty"""
+        if not self.count:
+            return None
+        left = self._index(self.grid.leftmost())
+        right = self._index(self.grid.rightmost())
+        bottom = self._index(self.grid.lowest())
+        return (int(self.left[left]), int(self.left[right] + self.width[right]),
+                int(self.top[bottom] + self.height[bottom]))
+
+    def lowest_in_columns(self):
+        """the lowest alien in each column, left to right"""
+        return [AlienView(self, alien_id) for alien_id in self.grid.column_bottoms()]
+
+    def drop(self, distance):
+        n = self.count
+        self.y[:n] += distance
+        self.top[:n] = _pygame_round(self.y[:n])
+
+    def reached(self, bottom):
+        if not self.count:
+            return False
+        i = self._index(self.grid.lowest())
+        return bool(self.top[i] + self.height[i] >= bottom)
+
+    def _collision_rect(self, alien_id):
+        i = self._index(alien_id)
+        return (int(self.left[i]), int(self.top[i]), int(self.width[i]), int(self.height[i]))
+
+    def _collision_mask(self, alien_id):
+        i = self._index(alien_id)
+        return assets.mask(self.images[self.kind[i]][self.image[i]],
+                           (int(self.width[i]), int(self.height[i])))
+
+    def sync_collisions(self):
+        """line the collision world's fleet layer up with where the fleet is now"""
+        if self.count:
+            self.world.anchor('aliens', self.grid.leftmost())
+
+    def alien(self, key):
+        """the alien behind a collision key"""
+        return AlienView(self, key)
+
+    def hit(self, i):
+        """start alien i exploding (see Aliens.hit)"""
+        if not self.dying[i]:
+            self.dying[i] = True
+            self.explosion_frame[i] = 0
+            self.explosion_time[i] = 0
+            self.image[i] = self.frame_counts[self.kind[i]]
+            self.game.sounds.play('alien_explosion')
+
+    def firing(self, rng, chance):
+        """the aliens that fire this tick, one draw from rng per alien"""
+        ids = self.ids[:self.count].tolist()
+        return [AlienView(self, alien_id) for alien_id in ids if rng.random() < chance]
+
+    def observe(self, rows):
+        """write each alien's (x, y, width, height, point value, dying) into the
+        rows of an int16 array, returning how many rows were written"""
+        n = min(self.count, len(rows))
+        rows[:n, 0] = self.left[:n]
+        rows[:n, 1] = self.top[:n]
+        rows[:n, 2] = self.width[:n]
+        rows[:n, 3] = self.height[:n]
+        rows[:n, 4] = self.point_values[self.kind[:n]]
+        rows[:n, 5] = self.dying[:n]
+        return n
+
+    def store_previous_positions(self):
+        n = self.count
+        self.prev_left[:n] = self.left[:n]
+        self.prev_top[:n] = self.top[:n]
+
+    def draw_fleet(self, queue, alpha=1.0):
+        """queue every alien alpha of the way from its previous position"""
+        n = self.count
+        left, top = self.left[:n], self.top[:n]
+        if alpha < 1.0 and self.settings.render_interpolation:
+            # Same rounding as SpaceInvaders._render_rect (Python's round)
+            left = left + np.round((self.prev_left[:n] - left) * (1 - alpha)).astype(np.int64)
+            top = top + np.round((self.prev_top[:n] - top) * (1 - alpha)).astype(np.int64)
+        if not n:
+            return
+        # Only build the layout's blits when it differs from the last one drawn
+        layout = np.stack((self.kind[:n], self.image[:n], left - left[0], top - top[0]))
+        if self.drawn_layout is None or not np.array_equal(layout, self.drawn_layout):
+            self.drawn_layout = layout
+            images = self.images
+            self.fleet_image.change([(images[kind][image], x, y) for kind, image, x, y in
+                                     zip(*layout.tolist())])
+        else:
+            self.fleet_image.hold()
+        self.fleet_image.blit(queue, int(left[0]), int(top[0]))
@@ -0,0 +1,239 @@
+"""Projectiles stored as preallocated NumPy arrays.
+
+Each projectile is a slot across a set of parallel arrays: position,
+velocity, owner, alive flag. Slots freed by dead projectiles are reused for
+new ones, so nothing is allocated per shot once the arrays are big enough.
+Movement, path sweeping and off-screen culling are single vectorized
+operations over every slot, and each owner's projectiles are queued for
+drawing in one batch.
+
+The arithmetic mirrors Bullet and AlienBullet exactly (float64 positions,
+pygame's rounding, the same swept paths), and projectiles are handed to the
+collision world in the order they were fired, so a game played with this
+engine matches the sprite engine tick for tick.
+"""
+import numpy as np
+import pygame
+
+import assets
+from array_fleet import _pygame_round
+from bullet import ALIEN, PLAYER
+from projectiles import LAYERS
+
+
+class ProjectileView:
+    """one projectile of an ArrayProjectiles store, looking like a Bullet
+
+    Views are handed out by sprites() and projectile() for code that works
+    with one projectile at a time (collision handling, barriers, bots).
+    A view goes dead with its projectile, even once the slot is reused.
+    """
+
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+        self.serial = int(store.serial[slot])
+        self.owner = int(store.owner[slot])
+
+    @property
+    def rect(self):
+        store, i = self.store, self.slot
+        return pygame.Rect(int(store.left[i]), int(store.top[i]),
+                           int(store.width[i]), int(store.height[i]))
+
+    @property
+    def path(self):
+        store, i = self.store, self.slot
+        return pygame.Rect(int(store.left[i]), int(store.path_top[i]),
+                           int(store.width[i]), int(store.path_height[i]))
+
+    @property
+    def mask(self):
+        return self.store._collision_mask(self.slot)
+
+    def reach(self, rect):
+        """how far along its path the projectile moves before touching rect
+        (see Bullet.reach and AlienBullet.reach)"""
+        path = self.path
+        height = int(self.store.height[self.slot])
+        if self.owner == PLAYER:
+            return max(0, path.bottom - height - rect.bottom + 1)
+        return max(0, rect.top + 1 - (path.top + height))
+
+    def alive(self):
+        store = self.store
+        return bool(store.alive[self.slot]) and store.serial[self.slot] == self.serial
+
+    def kill(self):
+        if self.alive():
+            self.store._free(np.array([self.slot]))
+
+
+class ArrayProjectiles:
+    """every projectile in play as parallel NumPy arrays, one slot per shot"""
+
+    def __init__(self, game, capacity=256):
+        self.game = game
+        self.settings = game.settings
+        self.next_serial = 0
+        # Free slots, lowest last so they are reused first
+        self.free = []
+        self.capacity = 0
+        self._allocate(capacity)
+
+        for layer in LAYERS.values():
+            game.collisions.use_masks(layer, self._collision_mask)
+
+    # Every per-slot array and its type
+    _fields = {
+        'serial': np.int64, 'owner': np.int8, 'alive': np.bool_,
+        # Exact vertical position, its velocity per 1/60 s and the rect it rounds to
+        'y': np.float64, 'vy': np.float64,
+        'left': np.int64, 'top': np.int64, 'width': np.int64, 'height': np.int64,
+        'prev_top': np.int64,
+        # Where the projectile is tested for collisions this tick
+        'path_top': np.int64, 'path_height': np.int64,
+    }
+
+    def _allocate(self, capacity):
+        """(re)allocate every array with room for capacity projectiles"""
+        old_capacity = self.capacity
+        for name, dtype in self._fields.items():
+            array = np.zeros(capacity, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:old_capacity] = old
+            setattr(self, name, array)
+        self.free = list(range(capacity - 1, old_capacity - 1, -1)) + self.free
+        self.capacity = capacity
+
+    def _free(self, slots):
+        """mark slots as dead, ready to be reused"""
+        self.alive[slots] = False
+        self.free.extend(slots.tolist())
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def __bool__(self):
+        return bool(self.alive.any())
+
+    def fire(self, owner, shooter):
+        """add a projectile fired by the ship (PLAYER) or an alien (ALIEN)"""
+        if not self.free:
+            self._allocate(self.capacity * 2)
+        i = self.free.pop()
+        settings = self.settings
+        # Placed as Bullet and AlienBullet place themselves
+        if owner == PLAYER:
+            rect = pygame.Rect(0, 0, settings.bullet_width, settings.bullet_height)
+            rect.midtop = shooter.rect.midtop
+            self.vy[i] = -settings.bullet_speed
+        else:
+            rect = pygame.Rect(0, 0, settings.alien_bullet_width, settings.alien_bullet_height)
+            rect.midbottom = shooter.rect.midbottom
+            self.vy[i] = settings.alien_bullet_speed
+        self.serial[i] = self.next_serial
+        self.next_serial += 1
+        self.owner[i] = owner
+        self.alive[i] = True
+        self.y[i] = rect.y
+        self.left[i] = rect.x
+        self.top[i] = self.prev_top[i] = self.path_top[i] = rect.y
+        self.width[i] = rect.width
+        self.height[i] = self.path_height[i] = rect.height
+
+    def _slots(self, owner=None):
+        """live slots in the order their projectiles were fired"""
+        live = self.alive if owner is None else self.alive & (self.owner == owner)
+        slots = np.flatnonzero(live)
+        return slots[np.argsort(self.serial[slots], kind='stable')]
+
+    def sprites(self, owner=None):
+        """a view of each projectile in the order they were fired, optionally one owner's"""
+        return [ProjectileView(self, slot) for slot in self._slots(owner).tolist()]
+
+    def count(self, owner):
+        return int(np.count_nonzero(self.alive & (self.owner == owner)))
+
+    def empty(self, owner=None):
+        """remove every projectile, or every projectile of one owner"""
+        self._free(self._slots(owner))
+
+    def update(self):
+        """move every projectile, dropping those whose whole path is off the screen"""
+        live = self.alive
+        if not live.any():
+            return
+        settings = self.settings
+        y = self.y
+        y[live] += self.vy[live] * settings.motion_scale
+        top = self.top
+        top[live] = _pygame_round(y[live])
+
+        # Sweep back over any gap since the previous rect (see bullet._sweep)
+        prev_top, height = self.prev_top, self.height
+        path_top = self.path_top
+        path_height = self.path_height
+        path_top[:] = top
+        path_height[:] = height
+        rose = prev_top > top + height
+        path_height[rose] = prev_top[rose] - top[rose]
+        fell = prev_top + height < top
+        path_top[fell] = prev_top[fell] + height[fell]
+        path_height[fell] = top[fell] - prev_top[fell]
+
+        gone = live & np.where(self.owner == PLAYER, path_top + path_height <= 0,
+                               path_top >= settings.screen_height)
+        if gone.any():
+            self._free(np.flatnonzero(gone))
+
+    def observe(self, owner, rows):
+        """write one owner's projectiles as (x, y, width, height, 0, 0) into the
+        rows of an int16 array, returning how many rows were written"""
+        slots = self._slots(owner)[:len(rows)]
+        n = len(slots)
+        rows[:n, 0] = self.left[slots]
+        rows[:n, 1] = self.top[slots]
+        rows[:n, 2] = self.width[slots]
+        rows[:n, 3] = self.height[slots]
+        rows[:n, 4:] = 0
+        return n
+
+    def store_previous_positions(self):
+        self.prev_top[:] = self.top
+
+    def sync_collisions(self):
+        """refill the collision world's projectile layers with every path, keyed by slot"""
+        world = self.game.collisions
+        for owner, layer in LAYERS.items():
+            slots = self._slots(owner)
+            world.add_arrays(layer, slots, self.left[slots], self.path_top[slots],
+                             self.width[slots], self.path_height[slots])
+
+    def projectile(self, key):
+        """the projectile behind a collision key"""
+        return ProjectileView(self, key)
+
+    def _collision_mask(self, slot):
+        return assets.solid_mask((int(self.width[slot]), int(self.path_height[slot])))
+
+    def draw_projectiles(self, queue, alpha=1.0):
+        """queue every projectile alpha of the way from its previous position"""
+        settings = self.settings
+        interpolate = alpha < 1.0 and settings.render_interpolation
+        colors = {PLAYER: settings.bullet_color, ALIEN: settings.alien_bullet_color}
+        # The player's shots first, then the aliens'
+        for owner in (PLAYER, ALIEN):
+            slots = self._slots(owner)
+            if not len(slots):
+                continue
+            top = self.top[slots]
+            if interpolate:
+                # Same rounding as SpaceInvaders._render_rect (Python's round)
+                top = top + np.round((self.prev_top[slots] - top) * (1 - alpha)).astype(np.int64)
+            # Every projectile of an owner is the same size, so one solid surface draws them all
+            image = queue.solid(colors[owner],
+                                (int(self.width[slots[0]]), int(self.height[slots[0]])))
+            queue.blits('projectiles', [(image, (x, y)) for x, y in
+                                        zip(self.left[slots].tolist(), top.tolist())])
@@ -0,0 +1,124 @@
+import pygame
+
+IMAGE_DIR = 'images'
+ALIEN_COLORS = ('pink', 'blue', 'green', 'red')
+
+# Loaded surfaces keyed by file name, shared by every sprite that uses them,
+# and the file name of each loaded surface
+_images = {}
+_frames = {}
+_names = {}
+# Collision masks keyed by (file name, size), and solid masks keyed by size
+_masks = {}
+_solid_masks = {}
+# Images are shrunk to 1/_pixel_size of their size as they load
+_pixel_size = 1
+
+
+def set_pixel_size(pixel_size):
+    """load images at 1/pixel_size of their size, for a low-resolution screen"""
+    global _pixel_size
+    if pixel_size != _pixel_size:
+        # Surfaces loaded at the old size would no longer fit
+        clear()
+        _pixel_size = pixel_size
+
+
+def _prepare(surface):
+    """convert a freshly loaded surface to the display's pixel format"""
+    if _pixel_size > 1:
+        # Nearest-neighbour, so pixel art stays crisp
+        width, height = surface.get_size()
+        surface = pygame.transform.scale(surface, (max(1, round(width / _pixel_size)),
+                                                   max(1, round(height / _pixel_size))))
+    if pygame.display.get_surface() is None:
+        # No display yet, keep the surface as loaded
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    # Colorkeyed and opaque images keep their colorkey through convert()
+    return surface.convert()
+
+
+def image(name):
+    """return the shared surface for an image in the images folder"""
+    surface = _images.get(name)
+    if surface is None:
+        surface = _prepare(pygame.image.load(f'{IMAGE_DIR}/{name}'))
+        _images[name] = surface
+        _names[surface] = name
+    return surface
+
+
+def frames(*names):
+    """return a shared list of surfaces for an animation"""
+    frame_list = _frames.get(names)
+    if frame_list is None:
+        frame_list = [image(name) for name in names]
+        _frames[names] = frame_list
+    return frame_list
+
+
+def mask(surface, size=None):
+    """return the collision mask of a surface, shared if it was loaded by image()
+
+    size crops the mask to a sprite's rect (from the top left) for frames
+    drawn larger than the rect they collide with. Masks of other surfaces
+    (rendered text, say) are built on every call rather than cached, since
+    those surfaces come and go.
+    """
+    name = _names.get(surface)
+    key = (name, size)
+    found = _masks.get(key) if name is not None else None
+    if found is None:
+        if size is not None:
+            width, height = surface.get_size()
+            surface = surface.subsurface((0, 0, min(width, size[0]), min(height, size[1])))
+        found = pygame.mask.from_surface(surface)
+        if name is not None:
+            _masks[key] = found
+    return found
+
+
+def solid_mask(size):
+    """return a shared mask with every bit set, for sprites drawn as filled rects"""
+    found = _solid_masks.get(size)
+    if found is None:
+        found = _solid_masks[size] = pygame.Mask(size, fill=True)
+    return found
+
+
+def alien_frames(color):
+    """return the (movement, explosion) frame lists for an alien color"""
+    return (
+        frames(f'{color}_alien_1.png', f'{color}_alien_2.png'),
+        frames(*(f'{color}_alien_explosion_{i}.png' for i in range(1, 4)))
+    )
+
+
+def ship_explosion_frames():
+    """return the shared ship explosion animation"""
+    return frames(*(f'ship_explosion_{i}.png' for i in range(1, 9)))
+
+
+def preload():
+    """load and convert every sprite image, and build its collision mask, up front"""
+    for color in ALIEN_COLORS:
+        frames, explosion_frames = alien_frames(color)
+        size = frames[0].get_size()
+        for frame in frames + explosion_frames:
+            mask(frame, size)
+    ship = image('ship.png')
+    for frame in [ship] + ship_explosion_frames():
+        mask(frame, ship.get_size())
+    ufo = image('ufo.png')
+    mask(ufo, ufo.get_size())
+
+
+def clear():
+    """forget every loaded surface, e.g. after the display mode changes"""
+    _images.clear()
+    _frames.clear()
+    _names.clear()
+    _masks.clear()
+    _solid_masks.clear()
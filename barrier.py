@@ -1,110 +1,143 @@
 import pygame
-import random
-from pygame.sprite import Sprite, Group
-from PIL import Image, ImageDraw
-
-class BarrierPiece(Sprite):
-    """single piece of the barrier that can be damaged"""
-    def __init__(self, barrier, x, y, width, height, color):
-        super().__init__()
-        self.screen = barrier.screen
-        self.color = color
-        
-        # Create the piece's rect and set its position
-        self.rect = pygame.Rect(0, 0, width, height)
-        self.rect.x = x
-        self.rect.y = y
-        
-        # Create a surface for the piece
-        self.image = pygame.Surface((width, height))
-        self.image.fill(color)
-        
-        # Damage level (0-100%)
-        self.damage = 0
-    
-    def hit(self):
-        """damage the barrier piece when hit by a bullet"""
-        # Increase damage
-        self.damage += 25
-        
-        # If damage is too high, destroy the piece
-        if self.damage >= 100:
-            self.kill()
-            return
-        
-        # Otherwise, create a transparent effect by removing random pixels
-        # Convert pygame surface to PIL Image
-        pil_image = Image.frombytes('RGBA', self.image.get_size(), 
-                                    pygame.image.tostring(self.image, 'RGBA'))
-        
-        # Create a drawing object
-        draw = ImageDraw.Draw(pil_image)
-        
-        # Determine how many pixels to make transparent
-        width, height = pil_image.size
-        num_pixels = int((width * height) * (self.damage / 400))  # 25% damage = ~6% of pixels
-        
-        # Make random pixels transparent
-        for _ in range(num_pixels):
-            x = random.randint(0, width-1)
-            y = random.randint(0, height-1)
-            draw.point((x, y), fill=(0, 0, 0, 0))  # Transparent
-        
-        # Convert back to Pygame surface
-        mode = pil_image.mode
-        size = pil_image.size
-        data = pil_image.tobytes()
-        
-        # Create a new surface with alpha channel
-        self.image = pygame.image.fromstring(data, size, mode).convert_alpha()
 
 
 class Barrier:
-    """defensive barrier that the ship can hide behind"""
+    """defensive barrier that the ship can hide behind
+
+    The barrier is a grid of small cells drawn on a single surface. A
+    bytearray holds how many more hits each cell can take (0 for no cell),
+    collisions are tested against that grid, and damage is painted straight
+    into the surface's pixels.
+    """
+    # Barrier and cell sizes in full-resolution pixels
+    size = (100, 75)
+    cell_size = 5
+    cell_strength = 4  # Hits a cell takes before it is destroyed
+
     def __init__(self, game, x_position):
         self.screen = game.screen
         self.settings = game.settings
         self.game = game
-        
+
         # Set barrier dimensions
-        self.width = 100
-        self.height = 75
+        px = self.settings.px
+        self.width, self.height = px(self.size[0]), px(self.size[1])
+        self.cell_width = self.cell_height = px(self.cell_size)
         self.color = (0, 255, 0)  # Green
         self.x = x_position
-        self.y = game.screen.get_rect().height - 150  # Position above ship
-        
-        # Create a group to hold all barrier pieces
-        self.pieces = Group()
-        
+        self.y = game.screen.get_rect().height - px(150)  # Position above ship
+        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+
+        self.columns = self.width // self.cell_width
+        self.rows = self.height // self.cell_height
+
         # Build the barrier
         self._build_barrier()
-    
+        self.piece_count = self.cells_left
+
     def _build_barrier(self):
-        piece_width = 5
-        piece_height = 5
-        
-        # Create grid of barrier pieces (except for a U-shaped gap)
-        for row in range(self.height // piece_height):
-            for col in range(self.width // piece_width):
-                # Skip pieces to create a U-shaped gap at the bottom
-                if (row >= self.height // piece_height - 4 and 
-                    col >= self.width // piece_width // 3 and 
-                    col < self.width // piece_width - self.width // piece_width // 3):
+        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        # Hits left in each cell, row by row
+        self.cells = bytearray(self.rows * self.columns)
+
+        # Fill the grid (except for a U-shaped gap)
+        for row in range(self.rows):
+            for col in range(self.columns):
+                # Skip cells to create a U-shaped gap at the bottom
+                if (row >= self.rows - 4 and
+                    col >= self.columns // 3 and
+                    col < self.columns - self.columns // 3):
                     continue
-                
-                # Create the piece
-                piece = BarrierPiece(
-                    self,
-                    self.x + col * piece_width,
-                    self.y + row * piece_height,
-                    piece_width,
-                    piece_height,
-                    self.color
-                )
-                self.pieces.add(piece)
-    
+
+                self.cells[row * self.columns + col] = self.cell_strength
+                self.image.fill(self.color, self._cell_rect(row, col))
+        self.cells_left = self.rows * self.columns - self.cells.count(0)
+
+    def _cell_rect(self, row, col):
+        """a cell's rect on the barrier's own surface"""
+        return pygame.Rect(col * self.cell_width, row * self.cell_height,
+                           self.cell_width, self.cell_height)
+
+    def _first_cell(self, rect, rising=False):
+        """index of the first standing cell rect overlaps, or None
+
+        Rows are searched from the top, or from the bottom for a bullet
+        rising through the barrier, and each row from the left.
+        """
+        if not self.rect.colliderect(rect):
+            return None
+
+        # Cells whose rect overlaps, by pygame's colliderect rules
+        first_col = max(0, (rect.left - self.x) // self.cell_width)
+        last_col = min(self.columns - 1, -(-(rect.right - self.x) // self.cell_width) - 1)
+        first_row = max(0, (rect.top - self.y) // self.cell_height)
+        last_row = min(self.rows - 1, -(-(rect.bottom - self.y) // self.cell_height) - 1)
+
+        cells = self.cells
+        rows = range(first_row, last_row + 1)
+        for row in (reversed(rows) if rising else rows):
+            start = row * self.columns
+            for index in range(start + first_col, start + last_col + 1):
+                if cells[index]:
+                    return index
+        return None
+
+    def contact(self, rect, rising=False):
+        """screen rect of the first standing cell a bullet moving through rect
+        meets, or None"""
+        index = self._first_cell(rect, rising)
+        if index is None:
+            return None
+        return self._cell_rect(*divmod(index, self.columns)).move(self.x, self.y)
+
+    def block(self, bullets):
+        """remove bullets that run into the barrier, without damaging it"""
+        for bullet in bullets:
+            if self._first_cell(bullet.path, rising=True) is not None:
+                bullet.kill()
+
+    def take_hits(self, bullets):
+        """remove bullets that run into the barrier, damaging the cells hit
+
+        A bullet damages the first cell on its path, and a cell hit by
+        several bullets at once is damaged once.
+        """
+        hit = set()
+        for bullet in bullets:
+            index = self._first_cell(bullet.path)
+            if index is not None:
+                hit.add(index)
+                bullet.kill()
+        for index in sorted(hit):
+            self.hit(index)
+
+    def hit(self, index):
+        """damage one cell, eating random pixels out of it"""
+        self.cells[index] -= 1
+        row, col = divmod(index, self.columns)
+        cell_rect = self._cell_rect(row, col)
+
+        # Destroyed cells disappear entirely
+        if not self.cells[index]:
+            self.cells_left -= 1
+            self.image.fill((0, 0, 0, 0), cell_rect)
+            return
+
+        # Otherwise make random pixels transparent, more as damage grows
+        damage = 25 * (self.cell_strength - self.cells[index])
+        num_pixels = int((self.cell_width * self.cell_height) * (damage / 400))  # 25% damage = ~6% of pixels
+        rng = self.game.random.barrier
+        for _ in range(num_pixels):
+            x = rng.randint(0, self.cell_width - 1)
+            y = rng.randint(0, self.cell_height - 1)
+            self.image.set_at((cell_rect.x + x, cell_rect.y + y), (0, 0, 0, 0))
+
+    def integrity(self):
+        """fraction of the barrier still standing"""
+        return self.cells_left / self.piece_count
+
     def update(self):
         pass  # No regular updates needed for static barriers
-    
-    def draw(self):
-        self.pieces.draw(self.screen)
+
+    def draw(self, queue):
+        queue.blit('barriers', self.image, self.rect)
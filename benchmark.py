@@ -0,0 +1,379 @@
+"""Scenario benchmarks for the game loop.
+
+    python benchmark.py --output bench.json
+    python benchmark.py fleet_spawn bullet_storm --frames 1200
+
+Each scenario puts a headless game into a known state, then runs the real
+update and render methods for a fixed number of frames. Every run is made
+twice: once timed with the frame profiler (per-phase p50/p95/p99 and frames
+per second) and once under tracemalloc (peak memory, the memory each frame
+allocates, blocks retained at the end and garbage collections triggered).
+Results are written as JSON so runs before and after a change can be
+compared.
+"""
+import argparse
+import gc
+import importlib
+import json
+import platform
+import random
+import tracemalloc
+
+import pygame
+
+from aliens import BlueAlien, GreenAlien, PinkAlien, RedAlien
+from bullet import ALIEN, PLAYER
+from profiler import FrameProfiler
+from settings import PIXEL_SIZES
+
+
+class Scenario:
+    """a game state to start from and the work done each frame"""
+
+    name = None
+    description = ''
+    render = True
+
+    def setup(self, game, seed):
+        """put the game into the scenario's starting state"""
+        game.input_source = lambda game, tick: 0
+        game._start_game(seed)
+
+    def before_frame(self, game, frame):
+        """untimed upkeep between frames, e.g. topping up bullets"""
+        if not game.game_active:
+            # Keep the load steady if the ship was lost
+            self.restarts += 1
+            self.setup(game, self.seed + self.restarts)
+
+    def run_frame(self, game):
+        game._update_game(game.settings.tick_ms)
+        if self.render:
+            game.profiler.mark()
+            game._update_screen()
+            game.profiler.lap('render')
+
+
+class FleetSpawn(Scenario):
+    name = 'fleet_spawn'
+    description = "full fleet marching from its spawn position, no firing"
+
+    def setup(self, game, seed):
+        game.settings.alien_firing_rate = 0
+        game.settings.ufo_appearance_rate = 0
+        super().setup(game, seed)
+
+
+class BulletStorm(Scenario):
+    name = 'bullet_storm'
+    description = "alien and player bullets raining on all four barriers"
+    bullets_per_frame = 4
+
+    def setup(self, game, seed):
+        game.settings.alien_firing_rate = 0
+        game.settings.ufo_appearance_rate = 0
+        super().setup(game, seed)
+        self.rng = random.Random(seed)
+        # Clear the fleet so the barriers take every hit
+        game.aliens.empty()
+
+    def before_frame(self, game, frame):
+        super().before_frame(game, frame)
+        # Rebuild the barriers before they are shot away, so every frame
+        # has the same amount of work
+        if sum(barrier.integrity() for barrier in game.barriers) < len(game.barriers) / 2:
+            game._create_barriers()
+
+        for _ in range(self.bullets_per_frame):
+            barrier = self.rng.choice(game.barriers)
+            x = barrier.x + self.rng.randrange(barrier.width)
+            muzzle = pygame.sprite.Sprite()
+            muzzle.rect = pygame.Rect(x, barrier.y - game.settings.px(40), 1, 1)
+            game.projectiles.fire(ALIEN, muzzle)
+
+        # The ship fires from under a random barrier
+        if game.projectiles.count(PLAYER) < game.settings.bullets_allowed:
+            barrier = self.rng.choice(game.barriers)
+            game.ship.rect.centerx = barrier.x + self.rng.randrange(barrier.width)
+            game.ship.x = float(game.ship.rect.x)
+            game.projectiles.fire(PLAYER, game.ship)
+
+
+class BulletHell(Scenario):
+    name = 'bullet_hell'
+    description = "thousands of alien bullets falling across the whole screen"
+    in_flight = 4000
+
+    def setup(self, game, seed):
+        game.settings.alien_firing_rate = 0
+        game.settings.ufo_appearance_rate = 0
+        super().setup(game, seed)
+        self.rng = random.Random(seed)
+        # Nothing stops the bullets but the bottom of the screen
+        game.barriers = []
+        game.collisions.clear('barriers')
+        # Park the ship above the screen, so the storm never pauses
+        game.ship.y = -2 * game.ship.rect.height
+        game.ship.rect.y = game.ship.y
+
+        # Start with the screen already full of bullets
+        self._fire(game, self.in_flight, game.settings.screen_height)
+
+    def _fire(self, game, count, depth):
+        """fire bullets from random points between the top of the screen and depth"""
+        muzzle = pygame.sprite.Sprite()
+        for _ in range(count):
+            x = self.rng.randrange(game.settings.screen_width)
+            muzzle.rect = pygame.Rect(x, self.rng.randrange(depth), 1, 1)
+            game.projectiles.fire(ALIEN, muzzle)
+
+    def before_frame(self, game, frame):
+        super().before_frame(game, frame)
+        # Replace the bullets that fell off the bottom
+        self._fire(game, self.in_flight - len(game.projectiles), 1)
+
+
+class LateWave(Scenario):
+    name = 'late_wave'
+    description = "a few fast aliens left after increase_speed"
+    survivors = 12
+
+    def setup(self, game, seed):
+        super().setup(game, seed)
+        rng = random.Random(seed)
+        aliens = game.aliens.sprites()
+        for alien in rng.sample(aliens, len(aliens) - self.survivors):
+            alien.kill()
+        game.settings.increase_speed(len(game.aliens), game.initial_alien_count)
+
+
+class UFOPass(Scenario):
+    name = 'ufo_pass'
+    description = "a UFO always crossing the screen above the fleet"
+
+    def setup(self, game, seed):
+        game.settings.alien_firing_rate = 0
+        # A new UFO appears on the first tick without one
+        game.settings.ufo_appearance_rate = 1 / game.settings.motion_scale
+        super().setup(game, seed)
+
+
+class LargeFleet(Scenario):
+    name = 'large_fleet'
+    description = "a formation many times the default size, packed onto the screen"
+    columns = 64
+    rows = 24
+
+    def setup(self, game, seed):
+        game.settings.alien_firing_rate = 0
+        game.settings.ufo_appearance_rate = 0
+        # The packed formation spans the screen, so it must not drop
+        game.settings.fleet_drop_speed = 0
+        super().setup(game, seed)
+        game.aliens.empty()
+        fleet_classes = (RedAlien, BlueAlien, BlueAlien, GreenAlien, GreenAlien, PinkAlien)
+        width, height = RedAlien.size()
+        step_x = (game.settings.screen_width - 3 * width) / self.columns
+        step_y = height / 2
+        for row in range(self.rows):
+            alien_class = fleet_classes[min(row * len(fleet_classes) // self.rows,
+                                            len(fleet_classes) - 1)]
+            for column in range(self.columns):
+                game.aliens.add_alien(alien_class, width + column * step_x,
+                                      height + row * step_y, (row, column))
+        game.initial_alien_count = len(game.aliens)
+
+
+class LaunchMenu(Scenario):
+    name = 'launch_screen'
+    description = "drawing the animated launch screen"
+    screen = 'launch'
+
+    def setup(self, game, seed):
+        super().setup(game, seed)
+        game.game_active = False
+        game.current_screen = self.screen
+
+    def before_frame(self, game, frame):
+        pass
+
+    def run_frame(self, game):
+        game._update_screen()
+        game.profiler.lap('render')
+
+
+class HighScoresMenu(LaunchMenu):
+    name = 'high_scores_screen'
+    description = "drawing the high scores screen"
+    screen = 'high_scores'
+
+
+class FleetRebuild(Scenario):
+    name = 'fleet_rebuild'
+    description = "emptying and rebuilding the whole fleet in _create_fleet"
+
+    def run_frame(self, game):
+        game.aliens.empty()
+        game.profiler.mark()
+        game._create_fleet()
+        game.profiler.lap('create_fleet')
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (
+    FleetSpawn, BulletStorm, BulletHell, LateWave, UFOPass, LargeFleet, LaunchMenu, HighScoresMenu,
+    FleetRebuild)}
+
+
+def _run(game, scenario, frames, seed, memory=None):
+    """run a scenario's frames once, returning the number of restarts
+
+    If memory is a dict (and tracemalloc is tracing), memory['peak'] is set
+    to the most memory traced at once, and memory['frames'] to the bytes
+    each frame allocates: how far traced memory rises above where it was
+    when the frame started, temporaries freed within the frame included.
+    """
+    scenario.seed = seed
+    scenario.restarts = 0
+    scenario.setup(game, seed)
+    profiler = game.profiler
+    if memory is not None:
+        _, memory['peak'] = tracemalloc.get_traced_memory()
+        memory['frames'] = []
+    for frame in range(frames):
+        scenario.before_frame(game, frame)
+        profiler.begin_frame()
+        if memory is None:
+            scenario.run_frame(game)
+        else:
+            start, peak = tracemalloc.get_traced_memory()
+            memory['peak'] = max(memory['peak'], peak)
+            tracemalloc.reset_peak()
+            scenario.run_frame(game)
+            _, peak = tracemalloc.get_traced_memory()
+            memory['frames'].append(peak - start)
+        profiler.end_frame()
+    if memory is not None:
+        memory['peak'] = max(memory['peak'], tracemalloc.get_traced_memory()[1])
+    return scenario.restarts
+
+
+def run_scenario(game, scenario_class, frames, seed, trace_path=None):
+    """time a scenario, then measure its memory use, returning the results"""
+    saved_settings = dict(vars(game.settings))
+
+    # Timed run
+    game.profiler = FrameProfiler(history=frames, trace_frames=frames)
+    restarts = _run(game, scenario_class(), frames, seed)
+    if trace_path:
+        game.profiler.export_trace(trace_path, {'scenario': scenario_class.name})
+    phases = game.profiler.summary()
+    counts = game.profiler.count_summary()
+    # Only the frames themselves count, not the untimed upkeep between them
+    elapsed = sum(game.profiler.phases['frame']) / 1000
+    vars(game.settings).update(saved_settings)
+
+    # Memory run, untimed since tracemalloc slows everything down
+    game.profiler = FrameProfiler(enabled=False)
+    gc.collect()
+    collections = sum(stats['collections'] for stats in gc.get_stats())
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    memory = {}
+    _run(game, scenario_class(), frames, seed, memory)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    collections = sum(stats['collections'] for stats in gc.get_stats()) - collections
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    frame_allocations = sorted(memory['frames'])
+    vars(game.settings).update(saved_settings)
+
+    return {
+        'description': scenario_class.description,
+        'frames': frames,
+        'seconds': round(elapsed, 4),
+        'fps': round(frames / elapsed, 1) if elapsed else None,
+        'restarts': restarts,
+        'phases': {name: {key: round(value, 4) for key, value in stats.items()}
+                   for name, stats in phases.items()},
+        'counts': {name: {key: round(value, 1) for key, value in stats.items()}
+                   for name, stats in counts.items()},
+        'peak_kb': round(memory['peak'] / 1024, 1),
+        'frame_alloc_kb': {
+            'p50': round(frame_allocations[frames // 2] / 1024, 1),
+            'p99': round(frame_allocations[min(frames - 1, frames * 99 // 100)] / 1024, 1),
+            'max': round(frame_allocations[-1] / 1024, 1),
+        },
+        'retained_blocks': retained_blocks,
+        'gc_collections': collections,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Space Invaders game loop scenarios")
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help="scenarios to run (default: all)")
+    parser.add_argument('--frames', type=int, default=600, help="frames per scenario")
+    parser.add_argument('--seed', type=int, default=1, help="random seed for each scenario")
+    parser.add_argument('--output', metavar='PATH', help="write the results as JSON")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="write each scenario's Chrome trace ({scenario} is replaced by its name)")
+    parser.add_argument('--fleet-engine', choices=('sprites', 'numpy'), default='sprites',
+                        help="alien fleet engine to benchmark")
+    parser.add_argument('--projectile-engine', choices=('sprites', 'numpy'), default='sprites',
+                        help="projectile engine to benchmark")
+    parser.add_argument('--pixel-size', type=int, default=1, metavar='N',
+                        help="run at 1/N resolution")
+    parser.add_argument('--dirty-rendering', action='store_true',
+                        help="present only the changed parts of the game screen")
+    parser.add_argument('--list', action='store_true', help="list the scenarios and exit")
+    args = parser.parse_args(argv)
+    if args.pixel_size not in PIXEL_SIZES:
+        parser.error(f"--pixel-size must be from {PIXEL_SIZES.start} to {PIXEL_SIZES.stop - 1}")
+
+    if args.list:
+        for name, scenario_class in SCENARIOS.items():
+            print(f"{name:20} {scenario_class.description}")
+        return
+
+    names = args.scenarios or list(SCENARIOS)
+    for name in names:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+
+    # The game module's file name has a dash, so import it by name
+    SpaceInvaders = importlib.import_module('space-invaders').SpaceInvaders
+    game = SpaceInvaders(headless=True, pixel_size=args.pixel_size)
+    game.settings.fleet_engine = args.fleet_engine
+    game.settings.projectile_engine = args.projectile_engine
+    game.settings.dirty_rendering = args.dirty_rendering
+
+    results = {}
+    for name in names:
+        trace_path = args.trace.replace('{scenario}', name) if args.trace else None
+        result = run_scenario(game, SCENARIOS[name], args.frames, args.seed, trace_path)
+        results[name] = result
+        frame = result['phases']['frame']
+        print(f"{name:20} {result['fps']:9.1f} fps  p50 {frame['p50']:7.3f} ms  "
+              f"p99 {frame['p99']:7.3f} ms  peak {result['peak_kb']:8.1f} KB  "
+              f"alloc p50 {result['frame_alloc_kb']['p50']:7.1f} KB  "
+              f"gc {result['gc_collections']}")
+
+    if args.output:
+        report = {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'frames': args.frames,
+            'seed': args.seed,
+            'fleet_engine': args.fleet_engine,
+            'projectile_engine': args.projectile_engine,
+            'dirty_rendering': args.dirty_rendering,
+            'pixel_size': args.pixel_size,
+            'scenarios': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,35 @@
 import pygame
 from pygame.sprite import Sprite
 
+import assets
+
+# Who fired a projectile
+PLAYER = 0
+ALIEN = 1
+
+
+def _sweep(rect, prev_rect):
+    """rect stretched back over any gap left since prev_rect
+
+    A bullet moving further than its own height in one tick jumps clean over
+    the ground between its old and new rects. Collisions are tested against
+    the new rect plus that gap, so nothing thinner than a step is skipped,
+    while the old rect (already tested last tick) is not tested again.
+    """
+    path = rect.copy()
+    if prev_rect.top > rect.bottom:
+        # Moved up
+        path.height = prev_rect.top - rect.top
+    elif prev_rect.bottom < rect.top:
+        # Moved down
+        path.top = prev_rect.bottom
+        path.height = rect.bottom - prev_rect.bottom
+    return path
+
+
 class Bullet(Sprite):
     """class to manage bullets fired from the ship"""
+    owner = PLAYER
     
     def __init__(self, ai_game):
         """create a bullet object at the ship's current position"""
@@ -18,20 +45,31 @@ class Bullet(Sprite):
         
         # Store the bullet's position as a decimal value
         self.y = float(self.rect.y)
+        self.prev_rect = self.rect.copy()
+        # Where the bullet is tested for collisions this tick
+        self.path = self.rect.copy()
     
     def update(self):
         """move the bullet up the screen"""
         # Update the decimal position of the bullet
-        self.y -= self.settings.bullet_speed
+        self.y -= self.settings.bullet_speed * self.settings.motion_scale
         # Update the rect position
         self.rect.y = self.y
+        self.path = _sweep(self.rect, self.prev_rect)
     
-    def draw_bullet(self):
-        """draw the bullet to the screen"""
-        pygame.draw.rect(self.screen, self.color, self.rect)
+    @property
+    def mask(self):
+        """collision mask of the bullet's path, which is drawn as a solid rect"""
+        return assets.solid_mask(self.path.size)
+    
+    def reach(self, rect):
+        """how far along its path the bullet moves before touching rect"""
+        start = self.path.bottom - self.rect.height
+        return max(0, start - rect.bottom + 1)
 
 
 class AlienBullet(Sprite):
+    owner = ALIEN
     
     def __init__(self, ai_game, alien):
         """create a bullet object at the alien's current position."""
@@ -47,12 +85,23 @@ class AlienBullet(Sprite):
         
         # Store the bullet's position as a decimal value
         self.y = float(self.rect.y)
+        self.prev_rect = self.rect.copy()
+        # Where the bullet is tested for collisions this tick
+        self.path = self.rect.copy()
     
     def update(self):
         # Update the decimal position of the bullet
-        self.y += self.settings.alien_bullet_speed
+        self.y += self.settings.alien_bullet_speed * self.settings.motion_scale
         # Update the rect position
         self.rect.y = self.y
+        self.path = _sweep(self.rect, self.prev_rect)
+    
+    @property
+    def mask(self):
+        """collision mask of the bullet's path, which is drawn as a solid rect"""
+        return assets.solid_mask(self.path.size)
     
-    def draw_bullet(self):
-        pygame.draw.rect(self.screen, self.color, self.rect)
+    def reach(self, rect):
+        """how far along its path the bullet moves before touching rect"""
+        start = self.path.top + self.rect.height
+        return max(0, rect.top + 1 - start)
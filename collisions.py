@@ -0,0 +1,223 @@
+"""A uniform spatial hash of everything that can collide.
+
+Entries are bucketed by layer (bullets, aliens, ship, UFO, barriers) and by
+grid cell. query() finds the contacts for every layer pair the game cares
+about in one pass, testing each entry only against entries that share a
+cell with it, so the cost follows the number of nearby pairs rather than
+the product of the layer sizes.
+
+Small layers that move freely (bullets, the ship) are cleared and refilled
+every tick. The fleet moves as one rigid block, so its layer is filled once
+and kept up to date as aliens come and go; each tick it is only re-anchored
+to where the fleet has moved (see anchor()). Layers of thousands of
+entries held in NumPy arrays are not bucketed at all (see add_arrays()).
+
+Rects are only the broad phase. Layers that can give each entry a collision
+mask (see use_masks()) have their rect hits confirmed pixel by pixel; masks
+are built once per image (assets.mask), so the narrow phase is a single
+Mask.overlap call per rect hit.
+"""
+
+
+class _Layer:
+    """one layer's entries and grid buckets, in layer-local coordinates"""
+
+    def __init__(self, rect_of=None, slack=0, mask_of=None):
+        # key -> (order added, local rect, cells covered)
+        self.entries = {}
+        # (cell x, cell y) -> {key: order added}
+        self.buckets = {}
+        self.next_order = 0
+        # Where local coordinates are on screen
+        self.offset_x = self.offset_y = 0
+        # How to read an entry's exact rect, if not from its local rect, and
+        # how far entries can stray from their local rect plus the offset
+        self.rect_of = rect_of
+        self.slack = slack
+        # How to read an entry's mask, lined up with its rect's top left
+        self.mask_of = mask_of
+        # (keys, x, y, width, height) arrays, for a layer added in bulk
+        self.arrays = None
+
+    def __len__(self):
+        if self.arrays is not None:
+            return len(self.arrays[0])
+        return len(self.entries)
+
+    def rect(self, key):
+        if self.rect_of:
+            return self.rect_of(key)
+        _, (x, y, width, height), _ = self.entries[key]
+        return (x + self.offset_x, y + self.offset_y, width, height)
+
+    def items(self):
+        """(key, order added, rect) for every entry"""
+        if self.arrays is not None:
+            keys, *rects = (array.tolist() for array in self.arrays)
+            return zip(keys, range(len(keys)), zip(*rects))
+        return ((key, order, self.rect(key)) for key, (order, _, _) in self.entries.items())
+
+
+class CollisionWorld:
+    """rects bucketed by layer and grid cell"""
+
+    def __init__(self, cell_size=64, pixel_perfect=True):
+        self.cell_size = cell_size
+        # Whether rect hits between masked layers are tested against masks
+        self.pixel_perfect = pixel_perfect
+        self.layers = {}
+
+    def reset(self):
+        """forget every layer"""
+        self.layers = {}
+
+    def track(self, layer, rect_of, slack=1, mask_of=None):
+        """make a layer rigid: entries keep their cells, and rect_of(key) gives
+        each entry's exact rect, within slack pixels of its local rect plus the
+        layer's offset"""
+        self.layers[layer] = _Layer(rect_of, slack, mask_of)
+
+    def use_masks(self, layer, mask_of):
+        """confirm a layer's rect hits with mask_of(key), each entry's mask"""
+        self._layer(layer).mask_of = mask_of
+
+    def _layer(self, layer):
+        found = self.layers.get(layer)
+        if found is None:
+            found = self.layers[layer] = _Layer()
+        return found
+
+    def _cells(self, x, y, width, height):
+        """the grid cells an (x, y, width, height) rect covers"""
+        size = self.cell_size
+        first_x, last_x = x // size, (x + width - 1) // size
+        first_y, last_y = y // size, (y + height - 1) // size
+        if first_x == last_x and first_y == last_y:
+            return ((first_x, first_y),)
+        return [(cell_x, cell_y) for cell_x in range(first_x, last_x + 1)
+                for cell_y in range(first_y, last_y + 1)]
+
+    def clear(self, layer):
+        """empty one layer"""
+        found = self.layers.get(layer)
+        if found is not None:
+            found.entries.clear()
+            found.buckets.clear()
+            found.arrays = None
+            found.offset_x = found.offset_y = 0
+
+    def add(self, layer, key, rect):
+        """add key to a layer; rect is a Rect or an (x, y, width, height) tuple"""
+        x, y, width, height = rect
+        # Empty rects never collide with anything
+        if width <= 0 or height <= 0:
+            return
+        found = self._layer(layer)
+        local = (x - found.offset_x, y - found.offset_y, width, height)
+        cells = self._cells(*local)
+        order = found.next_order
+        found.next_order += 1
+        found.entries[key] = (order, local, cells)
+        buckets = found.buckets
+        for cell in cells:
+            bucket = buckets.get(cell)
+            if bucket is None:
+                buckets[cell] = {key: order}
+            else:
+                bucket[key] = order
+
+    def add_all(self, layer, entries):
+        """add (key, rect) pairs to a layer"""
+        for key, rect in entries:
+            self.add(layer, key, rect)
+
+    def add_arrays(self, layer, keys, x, y, width, height):
+        """fill a layer from parallel NumPy arrays, in the order added
+
+        The layer isn't bucketed. It is tested with whole-array comparisons,
+        one per entry of the layer it is paired with, which costs far less
+        than bucketing thousands of entries that all move every tick.
+        """
+        found = self._layer(layer)
+        found.entries.clear()
+        found.buckets.clear()
+        found.arrays = (keys, x, y, width, height)
+
+    def remove(self, layer, key):
+        found = self.layers.get(layer)
+        entry = found and found.entries.pop(key, None)
+        if entry is None:
+            return
+        for cell in entry[2]:
+            bucket = found.buckets[cell]
+            del bucket[key]
+            if not bucket:
+                del found.buckets[cell]
+
+    def anchor(self, layer, key):
+        """move a rigid layer so that key's local rect lines up with its exact rect"""
+        found = self.layers[layer]
+        _, (x, y, _, _), _ = found.entries[key]
+        exact_x, exact_y, _, _ = found.rect_of(key)
+        found.offset_x = exact_x - x
+        found.offset_y = exact_y - y
+
+    def _nearby(self, layer, rect):
+        """{key: order added} for the entries of a layer whose cells a screen rect touches"""
+        x, y, width, height = rect
+        slack = layer.slack
+        nearby = {}
+        buckets = layer.buckets
+        for cell in self._cells(x - layer.offset_x - slack, y - layer.offset_y - slack,
+                                width + 2 * slack, height + 2 * slack):
+            bucket = buckets.get(cell)
+            if bucket:
+                nearby.update(bucket)
+        return nearby
+
+    def _touching(self, layer, rect):
+        """(key, order added, rect) for the entries of a layer a screen rect overlaps"""
+        ax, ay, aw, ah = rect
+        if layer.arrays is not None:
+            keys, x, y, width, height = layer.arrays
+            hits = ((ax < x + width) & (x < ax + aw) & (ay < y + height) & (y < ay + ah)).nonzero()[0]
+            return zip(keys[hits].tolist(), hits.tolist(),
+                       zip(x[hits].tolist(), y[hits].tolist(),
+                           width[hits].tolist(), height[hits].tolist()))
+
+        touching = []
+        for key, order in self._nearby(layer, rect).items():
+            rect_b = bx, by, bw, bh = layer.rect(key)
+            # The same test as Rect.colliderect
+            if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah:
+                touching.append((key, order, rect_b))
+        return touching
+
+    def contacts(self, layer_a, layer_b):
+        """(a, b) key pairs whose rects overlap, in the order a then b were added"""
+        a = self.layers.get(layer_a)
+        b = self.layers.get(layer_b)
+        if a is None or b is None or not a or not b:
+            return []
+
+        # Walk the smaller layer, looking up its neighbours in the other
+        swapped = len(a) > len(b)
+        if swapped:
+            a, b = b, a
+        masked = self.pixel_perfect and a.mask_of and b.mask_of
+        found = []
+        for key_a, order_a, rect_a in a.items():
+            ax, ay, _, _ = rect_a
+            for key_b, order_b, (bx, by, _, _) in self._touching(b, rect_a):
+                if masked and not a.mask_of(key_a).overlap(b.mask_of(key_b), (bx - ax, by - ay)):
+                    continue
+                if swapped:
+                    found.append((order_b, order_a, key_b, key_a))
+                else:
+                    found.append((order_a, order_b, key_a, key_b))
+        found.sort(key=lambda contact: contact[:2])
+        return [(key_a, key_b) for _, _, key_a, key_b in found]
+
+    def query(self, pairs):
+        """contacts for each (layer a, layer b) pair, as {pair: [(a, b), ...]}"""
+        return {pair: self.contacts(*pair) for pair in pairs}
@@ -0,0 +1,92 @@
+import random
+
+# Input state is one byte per frame: a bit for each control held down
+LEFT = 1
+RIGHT = 2
+UP = 4
+DOWN = 8
+FIRE = 16
+
+KEY_NAMES = {'LEFT': LEFT, 'RIGHT': RIGHT, 'UP': UP, 'DOWN': DOWN, 'FIRE': FIRE}
+
+
+class ScriptedInput:
+    """input read from a script file
+
+    Each line is a frame number followed by the controls held from that
+    frame on, e.g. ``120 LEFT FIRE``. A line with only a frame number
+    releases everything. Blank lines and lines starting with # are ignored.
+    """
+
+    def __init__(self, path):
+        self.steps = []
+        with open(path, 'r') as f:
+            for line in f:
+                words = line.split()
+                if not words or words[0].startswith('#'):
+                    continue
+                state = 0
+                for name in words[1:]:
+                    state |= KEY_NAMES[name.upper()]
+                self.steps.append((int(words[0]), state))
+        self.steps.sort()
+        self.index = 0
+        self.state = 0
+
+    def __call__(self, game, frame):
+        while self.index < len(self.steps) and self.steps[self.index][0] <= frame:
+            self.state = self.steps[self.index][1]
+            self.index += 1
+        return self.state
+
+
+class RandomBot:
+    """mashes controls at random, holding each direction for a while"""
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.direction = 0
+        self.hold = 0
+
+    def __call__(self, game, frame):
+        if self.hold <= 0:
+            self.direction = self.rng.choice((0, LEFT, RIGHT))
+            self.hold = self.rng.randint(10, 60)
+        self.hold -= 1
+
+        # Fire is edge triggered, so release it between shots
+        state = self.direction
+        if frame % 2 == 0 and self.rng.random() < 0.3:
+            state |= FIRE
+        return state
+
+
+class TrackingBot:
+    """moves under the nearest living alien and fires at it"""
+
+    def __call__(self, game, frame):
+        ship_x = game.ship.rect.centerx
+        targets = [alien.rect.centerx for alien in game.aliens.sprites() if not alien.dying]
+        if not targets:
+            return 0
+
+        target_x = min(targets, key=lambda x: abs(x - ship_x))
+        state = 0
+        if target_x < ship_x - 4:
+            state |= LEFT
+        elif target_x > ship_x + 4:
+            state |= RIGHT
+        if frame % 2 == 0:
+            state |= FIRE
+        return state
+
+
+def make_controller(name, seed=None):
+    """build an input source from a command line name or script path"""
+    if name == 'random':
+        return RandomBot(seed)
+    if name == 'bot':
+        return TrackingBot()
+    if name == 'none':
+        return lambda game, frame: 0
+    return ScriptedInput(name)
@@ -0,0 +1,43 @@
+"""Dirty-rectangle rendering for the gameplay screen.
+
+Most of the screen is plain background from one frame to the next. Instead
+of filling the whole screen and flipping it every frame, DirtyRects keeps
+the rects everything was drawn into last frame. The next frame restores the
+background under just those rects, draws the frame as usual, and presents
+only last frame's rects plus this frame's with pygame.display.update().
+Everything outside them is background in both frames, so the picture is
+the same as a full redraw.
+"""
+import pygame
+
+
+class DirtyRects:
+    """the screen's damage from one frame to the next"""
+
+    def __init__(self, screen, color):
+        self.screen = screen
+        # The cached background restored under last frame's rects
+        self.background = pygame.Surface(screen.get_size()).convert(screen)
+        self.background.fill(color)
+        # Rects drawn last frame, or None when the whole screen must be redrawn
+        self.previous = None
+
+    def invalidate(self):
+        """redraw the whole screen next frame, e.g. after something else drew on it"""
+        self.previous = None
+
+    def begin(self):
+        """restore the background wherever last frame drew"""
+        if self.previous is None:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            background = self.background
+            self.screen.blits([(background, rect, rect) for rect in self.previous], False)
+
+    def present(self, drawn):
+        """show the frame, given every rect drawn since begin()"""
+        if self.previous is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + drawn)
+        self.previous = drawn
@@ -0,0 +1,267 @@
+"""Gym-style environment around the game logic, for training and evaluating bots.
+
+    env = SpaceInvadersEnv()
+    obs = env.reset(seed=1)
+    obs, reward, done, info = env.step(FIRE_ACTION)
+
+Observations are one of:
+
+- 'features': a small float32 vector (ship, fleet extents, UFO, nearby bullets)
+- 'entities': the packed int16 entity array from observation.py
+- 'frame': the rendered screen, downsampled, as a (width, height, 3) uint8 array
+
+VectorEnv steps several independent games at once, one process per game,
+with observations, rewards and done flags exchanged through shared memory.
+"""
+import importlib
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from bullet import ALIEN, PLAYER
+from controls import LEFT, RIGHT, FIRE
+from observation import Observer, entity_shape, frame_shape
+from settings import Settings
+
+# Discrete actions, as input states (see controls.py)
+ACTIONS = (0, LEFT, RIGHT, FIRE, LEFT | FIRE, RIGHT | FIRE)
+NOOP_ACTION, LEFT_ACTION, RIGHT_ACTION, FIRE_ACTION, LEFT_FIRE_ACTION, RIGHT_FIRE_ACTION = range(6)
+
+# Nearest alien bullets included in the observation
+MAX_OBSERVED_BULLETS = 8
+OBS_SIZE = 14 + 2 * MAX_OBSERVED_BULLETS
+
+
+def _load_game_class():
+    # The game module's file name has a dash, so import it by name
+    return importlib.import_module('space-invaders').SpaceInvaders
+
+
+class SpaceInvadersEnv:
+    """one headless game, stepped a fixed number of ticks per action"""
+
+    def __init__(self, frame_skip=1, max_ticks=None, observation='features', downsample=4):
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.observation = observation
+        self.game = _load_game_class()(headless=True)
+        self.game.input_source = self._current_input
+        self.action_state = 0
+        self.observer = Observer(self.game, downsample)
+
+        # Filled in place on every step
+        self.obs = np.zeros(*observation_spec(observation, self.game.settings, downsample))
+        self.last_score = 0
+
+    def _current_input(self, game, tick):
+        return self.action_state
+
+    def reset(self, seed=None):
+        """start a new game, returning the first observation"""
+        self.action_state = 0
+        self.game._start_game(seed)
+        self.last_score = 0
+        return self._observe()
+
+    def step(self, action):
+        """apply an action for frame_skip ticks: (observation, reward, done, info)"""
+        game = self.game
+        self.action_state = ACTIONS[action]
+        tick_ms = game.settings.tick_ms
+        for _ in range(self.frame_skip):
+            game._update_game(tick_ms)
+            if game.ship.lives <= 0 or not game.game_active:
+                break
+
+        score = game.stats.score
+        reward = score - self.last_score
+        self.last_score = score
+        done = game.ship.lives <= 0 or not game.game_active
+        if self.max_ticks is not None and game.tick >= self.max_ticks:
+            done = True
+        info = {'score': score, 'tick': game.tick, 'lives': game.ship.lives}
+        return self._observe(), reward, done, info
+
+    def _observe(self):
+        """fill the preallocated observation in place"""
+        if self.observation == 'entities':
+            self.obs[:] = self.observer.update()
+        elif self.observation == 'frame':
+            self.game._update_screen()
+            frame = self.observer.frame()
+            self.obs[:] = frame
+            # Unlock the display before anything else is drawn
+            del frame
+        else:
+            self._observe_features()
+        return self.obs
+
+    def _observe_features(self):
+        game = self.game
+        obs = self.obs
+        width = game.settings.screen_width
+        height = game.settings.screen_height
+        ship = game.ship.rect
+
+        obs[0] = ship.centerx / width
+        obs[1] = ship.centery / height
+        obs[2] = game.ship.lives
+        obs[3] = game.ship.exploding
+
+        # Fleet extents
+        obs[4] = len(game.aliens)
+        extents = game.aliens.extents()
+        if extents:
+            left, right, bottom = extents
+            obs[5] = left / width
+            obs[6] = right / width
+            obs[7] = bottom / height
+        else:
+            obs[5:8] = 0
+        obs[8] = game.settings.fleet_direction
+        obs[9] = game.settings.alien_speed
+
+        # UFO
+        obs[10] = game.ufo is not None
+        obs[11] = game.ufo.rect.centerx / width if game.ufo else 0
+
+        obs[12] = game.projectiles.count(PLAYER)
+        obs[13] = game.hit_pause > 0
+
+        # Nearest alien bullets, relative to the ship
+        bullets = sorted(game.projectiles.sprites(ALIEN),
+                         key=lambda bullet: abs(bullet.rect.centerx - ship.centerx))
+        bullet_obs = obs[14:].reshape(MAX_OBSERVED_BULLETS, 2)
+        bullet_obs[:] = 0
+        for i, bullet in enumerate(bullets[:MAX_OBSERVED_BULLETS]):
+            bullet_obs[i, 0] = (bullet.rect.centerx - ship.centerx) / width
+            bullet_obs[i, 1] = (ship.top - bullet.rect.bottom) / height
+
+
+def observation_spec(observation, settings, downsample):
+    """(shape, dtype) of one observation"""
+    if observation == 'features':
+        return (OBS_SIZE,), np.float32
+    if observation == 'entities':
+        return entity_shape(settings), np.int16
+    if observation == 'frame':
+        return frame_shape(settings, downsample), np.uint8
+    raise ValueError(f"unknown observation type {observation!r}")
+
+
+def _vector_worker(conn, index, num_envs, shm_name, seed, env_args):
+    """runs one environment, reading its action and writing results in shared memory"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    env = SpaceInvadersEnv(*env_args)
+    obs, rewards, dones, actions = _shared_views(
+        shm.buf, num_envs, *observation_spec(env.observation, env.game.settings, env_args[3]))
+    episode = 0
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == b'step':
+                ob, reward, done, info = env.step(int(actions[index]))
+                rewards[index] = reward
+                dones[index] = done
+                if done:
+                    # Start the next episode straight away
+                    episode += 1
+                    conn.send((info['score'], info['tick']))
+                    ob = env.reset(None if seed is None else seed + episode * num_envs)
+                else:
+                    conn.send(None)
+                obs[index] = ob
+            elif command == b'reset':
+                episode = 0
+                obs[index] = env.reset(None if seed is None else seed)
+                conn.send(None)
+            else:
+                break
+    finally:
+        del obs, rewards, dones, actions
+        shm.close()
+
+
+def _shared_layout(num_envs, shape, dtype):
+    """offset of the observations and total size of the shared block"""
+    # Rewards (float32), dones and actions (a byte each), then observations
+    obs_offset = -(-num_envs * 6 // 8) * 8
+    obs_bytes = num_envs * int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return obs_offset, obs_offset + obs_bytes
+
+
+def _shared_views(buf, num_envs, shape, dtype):
+    """numpy views of the observation, reward, done and action arrays"""
+    obs_offset, _ = _shared_layout(num_envs, shape, dtype)
+    rewards = np.ndarray((num_envs,), dtype=np.float32, buffer=buf)
+    dones = np.ndarray((num_envs,), dtype=np.bool_, buffer=buf, offset=num_envs * 4)
+    actions = np.ndarray((num_envs,), dtype=np.int8, buffer=buf, offset=num_envs * 5)
+    obs = np.ndarray((num_envs, *shape), dtype=dtype, buffer=buf, offset=obs_offset)
+    return obs, rewards, dones, actions
+
+
+class VectorEnv:
+    """N independent games stepped in parallel, one process each
+
+    Games that finish are reset automatically; step() reports the final
+    score of each finished episode in infos.
+    """
+
+    def __init__(self, num_envs, seed=None, frame_skip=1, max_ticks=None,
+                 observation='features', downsample=4):
+        self.num_envs = num_envs
+        env_args = (frame_skip, max_ticks, observation, downsample)
+
+        # Observation shape, without starting a game in this process
+        spec = observation_spec(observation, Settings(), downsample)
+        _, size = _shared_layout(num_envs, *spec)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.obs, self.rewards, self.dones, self.actions = _shared_views(
+            self.shm.buf, num_envs, *spec)
+
+        self.conns = []
+        self.processes = []
+        for index in range(num_envs):
+            parent_conn, child_conn = mp.Pipe()
+            env_seed = None if seed is None else seed + index
+            process = mp.Process(target=_vector_worker, daemon=True,
+                                 args=(child_conn, index, num_envs, self.shm.name,
+                                       env_seed, env_args))
+            process.start()
+            self.conns.append(parent_conn)
+            self.processes.append(process)
+
+    def reset(self):
+        """reset every game, returning its observations stacked as one
+        (num_envs, *shape) array, shape being observation_spec()'s"""
+        for conn in self.conns:
+            conn.send_bytes(b'reset')
+        for conn in self.conns:
+            conn.recv()
+        return self.obs
+
+    def step(self, actions):
+        """step every game with its action: (observations, rewards, dones, infos)
+
+        The returned arrays are views of shared memory, overwritten by the
+        next step; copy them to keep them.
+        """
+        self.actions[:] = actions
+        for conn in self.conns:
+            conn.send_bytes(b'step')
+        infos = []
+        for conn in self.conns:
+            finished = conn.recv()
+            infos.append({} if finished is None else
+                         {'episode_score': finished[0], 'episode_ticks': finished[1]})
+        return self.obs, self.rewards, self.dones, infos
+
+    def close(self):
+        for conn in self.conns:
+            conn.send_bytes(b'close')
+        for process in self.processes:
+            process.join()
+        del self.obs, self.rewards, self.dones, self.actions
+        self.shm.close()
+        self.shm.unlink()
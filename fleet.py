@@ -0,0 +1,288 @@
+"""Alien fleet engines.
+
+The game talks to its fleet through a small set of fleet-level methods, so
+the storage behind it can change:
+
+- SpriteFleet: a sprite group of Aliens objects, each updating itself
+- ArrayFleet (array_fleet.py): the whole fleet in NumPy arrays, updated with
+  vectorized operations, for very large formations
+
+Settings.fleet_engine picks one ('sprites' or 'numpy'). Both give exactly the
+same game, tick for tick, so replays play back the same on either.
+
+Both engines keep a FleetGrid alongside the aliens, so edge and bottom checks
+look at one alien instead of scanning the whole fleet, and draw through a
+FleetImage, so the fleet is queued as one blit instead of one per alien.
+"""
+from operator import attrgetter
+
+import pygame
+from pygame.sprite import Group
+
+
+class FleetGrid:
+    """which (row, column) cells of the formation still hold an alien
+
+    The fleet moves as one block, so every alien in a column has the same x
+    and every alien in a row the same y. Any alien in the leftmost column is
+    as far left as the fleet goes, any alien in the lowest row as low, and so
+    on. Extents are only recomputed when a row or column empties.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        # row -> {column: alien} and column -> {row: alien}
+        self.rows = {}
+        self.columns = {}
+        self.left = self.right = self.bottom = None
+        # Lowest occupied row of each column
+        self.column_lowest = {}
+
+    def __len__(self):
+        return sum(len(row) for row in self.rows.values())
+
+    def add(self, row, column, alien):
+        self.rows.setdefault(row, {})[column] = alien
+        self.columns.setdefault(column, {})[row] = alien
+        if self.left is None:
+            self.left = self.right = column
+            self.bottom = row
+        else:
+            self.left = min(self.left, column)
+            self.right = max(self.right, column)
+            self.bottom = max(self.bottom, row)
+        self.column_lowest[column] = max(self.column_lowest.get(column, row), row)
+
+    def remove(self, row, column):
+        row_cells = self.rows[row]
+        del row_cells[column]
+        column_cells = self.columns[column]
+        del column_cells[row]
+
+        if not column_cells:
+            del self.columns[column]
+            del self.column_lowest[column]
+            if column in (self.left, self.right):
+                self.left = min(self.columns, default=None)
+                self.right = max(self.columns, default=None)
+        elif row == self.column_lowest[column]:
+            self.column_lowest[column] = max(column_cells)
+
+        if not row_cells:
+            del self.rows[row]
+            if row == self.bottom:
+                self.bottom = max(self.rows, default=None)
+
+    def row_count(self, row):
+        return len(self.rows.get(row, ()))
+
+    def column_count(self, column):
+        return len(self.columns.get(column, ()))
+
+    def leftmost(self):
+        """an alien in the leftmost occupied column"""
+        return next(iter(self.columns[self.left].values()))
+
+    def rightmost(self):
+        """an alien in the rightmost occupied column"""
+        return next(iter(self.columns[self.right].values()))
+
+    def lowest(self):
+        """an alien in the lowest occupied row"""
+        return next(iter(self.rows[self.bottom].values()))
+
+    def lowest_in_column(self, column):
+        """the lowest alien left in a column, or None"""
+        row = self.column_lowest.get(column)
+        return None if row is None else self.columns[column][row]
+
+    def column_bottoms(self):
+        """the lowest alien in each occupied column, left to right"""
+        return [self.columns[column][self.column_lowest[column]]
+                for column in sorted(self.columns)]
+
+
+class FleetImage:
+    """the fleet composited into one cached surface
+
+    Aliens move as one block and animate together, so the fleet looks the
+    same from one frame to the next until an alien dies, an explosion frame
+    advances or the animation flips. The surface is only redrawn when the
+    layout changes (each alien's image and where it sits relative to the
+    first alien), and is otherwise blitted once wherever the fleet is.
+
+    A new layout is drawn one alien at a time and only composited once it is
+    drawn again unchanged, so a layout that changes every frame (a fleet
+    spaced unevenly enough for rounding to shift aliens in and out of step)
+    costs no more than drawing the aliens one by one.
+    """
+
+    def __init__(self):
+        # (image, x, y) per alien, relative to the first alien
+        self.layout = None
+        self.surface = None
+        # Whether the layout is new this frame, so not composited yet
+        self.changed = False
+        # Where the surface's top left is relative to the first alien
+        self.offset = (0, 0)
+
+    def draw(self, queue, blits):
+        """queue a list of (image, position) blits to be drawn"""
+        if not blits:
+            return
+        x, y = blits[0][1][:2]
+        layout = [(image, left - x, top - y) for image, (left, top, *_) in blits]
+        if layout != self.layout:
+            self.change(layout)
+        else:
+            self.hold()
+        self.blit(queue, x, y)
+
+    def change(self, layout):
+        """switch to a new layout, drawn one alien at a time for now"""
+        self.layout = layout
+        self.surface = None
+        self.changed = True
+
+    def hold(self):
+        """keep the layout for another frame, compositing it the first time"""
+        if self.changed:
+            self.changed = False
+            self._composite()
+
+    def _composite(self):
+        """draw the layout into the cached surface, if it can be"""
+        layout = self.layout
+        rects = [image.get_rect(topleft=(x, y)) for image, x, y in layout]
+        # Translucent images (explosions) that overlap wouldn't blend the same
+        # drawn onto each other first, so they are drawn one by one instead
+        translucent = [rect for (image, _, _), rect in zip(layout, rects)
+                       if image.get_flags() & pygame.SRCALPHA]
+        if any(rect.collidelist(translucent[i + 1:]) != -1
+               for i, rect in enumerate(translucent)):
+            return
+        bounds = rects[0].unionall(rects[1:])
+        colorkeys = {image.get_colorkey() for image, _, _ in layout}
+        if translucent or len(colorkeys) > 1 or None in colorkeys:
+            self.surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        else:
+            # Colorkeyed images keep their colorkey, and run-length encoding
+            # skips the gaps between aliens quickly
+            colorkey = colorkeys.pop()
+            self.surface = pygame.Surface(bounds.size)
+            self.surface.fill(colorkey)
+            self.surface.set_colorkey(colorkey, pygame.RLEACCEL)
+        self.surface.blits([(image, (x - bounds.x, y - bounds.y)) for image, x, y in layout],
+                           False)
+        self.offset = bounds.topleft
+
+    def blit(self, queue, x, y):
+        """queue the current layout with its first alien at (x, y)"""
+        if self.surface is None:
+            queue.blits('aliens', [(image, (x + left, y + top)) for image, left, top in self.layout])
+            return
+        offset_x, offset_y = self.offset
+        queue.blit('aliens', self.surface, (x + offset_x, y + offset_y))
+
+
+class SpriteFleet(Group):
+    """the fleet as a sprite group, one Aliens object per alien"""
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+        self.grid = FleetGrid()
+        # The fleet's layer of the collision world, kept in step with it
+        self.world = game.collisions
+        self.world.track('aliens', attrgetter('rect'), mask_of=attrgetter('mask'))
+        self.fleet_image = FleetImage()
+
+    def add_alien(self, alien_class, x, y, cell):
+        """add an alien at (x, y), in the (row, column) cell of the formation"""
+        alien = alien_class(self.game, x, y)
+        alien.cell = cell
+        self.add(alien)
+        self.grid.add(*cell, alien)
+        self.world.add('aliens', alien, alien.rect)
+
+    def remove_internal(self, sprite):
+        # Called however an alien leaves: killed at the end of its
+        # explosion, removed, or emptied with the rest of the fleet
+        super().remove_internal(sprite)
+        self.grid.remove(*sprite.cell)
+        self.world.remove('aliens', sprite)
+
+    def at_edge(self):
+        """whether any alien touches the side of the screen"""
+        if not self:
+            return False
+        return self.grid.leftmost().check_edges() or self.grid.rightmost().check_edges()
+
+    def extents(self):
+        """(left, right, bottom) of the fleet, or None if it is empty"""
+        if not self:
+            return None
+        return (self.grid.leftmost().rect.left, self.grid.rightmost().rect.right,
+                self.grid.lowest().rect.bottom)
+
+    def lowest_in_columns(self):
+        """the lowest alien in each column, left to right"""
+        return self.grid.column_bottoms()
+
+    def drop(self, distance):
+        for alien in self.sprites():
+            alien.y += distance
+            alien.rect.y = alien.y
+
+    def reached(self, bottom):
+        """whether any alien has reached the given height"""
+        return bool(self) and self.grid.lowest().rect.bottom >= bottom
+
+    def sync_collisions(self):
+        """line the collision world's fleet layer up with where the fleet is now"""
+        if self:
+            self.world.anchor('aliens', self.grid.leftmost())
+
+    def alien(self, key):
+        """the alien behind a collision key"""
+        return key
+
+    def firing(self, rng, chance):
+        """the aliens that fire this tick, one draw from rng per alien"""
+        return [alien for alien in self.sprites() if rng.random() < chance]
+
+    def observe(self, rows):
+        """write each alien's (x, y, width, height, point value, dying) into the
+        rows of an int16 array, returning how many rows were written"""
+        values = [(*alien.rect, alien.point_value, alien.dying)
+                  for alien in self.sprites()[:len(rows)]]
+        if values:
+            rows[:len(values)] = values
+        return len(values)
+
+    def store_previous_positions(self):
+        for alien in self.sprites():
+            alien.prev_rect = alien.rect.copy()
+
+    def draw_fleet(self, queue, alpha=1.0):
+        """queue every alien alpha of the way from its previous position"""
+        if alpha >= 1.0:
+            self.fleet_image.draw(queue, [(alien.image, alien.rect) for alien in self.sprites()])
+            return
+        render_rect = self.game._render_rect
+        self.fleet_image.draw(queue, [(alien.image, render_rect(alien, alpha))
+                                      for alien in self.sprites()])
+
+
+def make_fleet(game):
+    """an empty fleet using the engine chosen in the game's settings"""
+    engine = game.settings.fleet_engine
+    if engine == 'sprites':
+        return SpriteFleet(game)
+    if engine == 'numpy':
+        # NumPy is only needed when this engine is used
+        from array_fleet import ArrayFleet
+        return ArrayFleet(game)
+    raise ValueError(f"unknown fleet engine {engine!r}")
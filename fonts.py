@@ -0,0 +1,97 @@
+from collections import OrderedDict
+import pygame
+
+# Resolved fonts keyed by (face, size, bold)
+_fonts = {}
+
+
+def font(face, size, bold=False):
+    """return a shared SysFont, resolving each (face, size, bold) only once"""
+    key = (face, size, bold)
+    resolved = _fonts.get(key)
+    if resolved is None:
+        resolved = pygame.font.SysFont(face, size, bold=bold)
+        _fonts[key] = resolved
+    return resolved
+
+
+class TextCache:
+    """bounded LRU cache of rendered text surfaces"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font_key, text, antialias, color, background=None):
+        """return the rendered surface for text, rendering it on a miss"""
+        key = (font_key, text, antialias, color, background)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font(*font_key).render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+text_cache = TextCache()
+
+
+def render(text, face, size, color, bold=False, antialias=True, background=None):
+    """render text through the shared cache"""
+    return text_cache.render((face, size, bold), text, antialias, color, background)
+
+
+class GlyphAtlas:
+    """glyphs of one font and color rendered once, side by side on one surface
+
+    Text made of the atlas's glyphs (digits and commas, say, plus a few
+    whole labels) is composed by copying each glyph out of the atlas, so
+    numbers that change every few frames never rasterize text again. Glyphs
+    are rendered on an opaque background, so composing is plain copying.
+    """
+
+    def __init__(self, face, size, color, background, glyphs='0123456789,', labels=()):
+        rendered = font(face, size)
+        images = [(text, rendered.render(text, True, color, background))
+                  for text in [*glyphs, *labels]]
+        self.height = rendered.get_height()
+        self.surface = pygame.Surface((sum(image.get_width() for _, image in images),
+                                       self.height)).convert()
+        self.surface.fill(background)
+        # Glyph or label -> its area of the atlas
+        self.areas = {}
+        x = 0
+        for text, image in images:
+            self.areas[text] = self.surface.blit(image, (x, 0))
+            x += image.get_width()
+
+    def width(self, parts):
+        """how wide parts (glyphs and labels) are, side by side"""
+        return sum(self.areas[part].width for part in parts)
+
+    def compose(self, parts, surface=None):
+        """parts side by side, drawn over surface if it is the right size"""
+        size = (self.width(parts), self.height)
+        if surface is None or surface.get_size() != size:
+            surface = pygame.Surface(size, 0, self.surface)
+        blits = []
+        x = 0
+        for part in parts:
+            area = self.areas[part]
+            blits.append((self.surface, (x, 0), area))
+            x += area.width
+        surface.blits(blits, False)
+        return surface
@@ -0,0 +1,160 @@
+import math
+import random
+import pygame
+
+import assets
+import fonts
+
+STARFIELD_SEED = 1978  # Keeps the starfield the same every time it is built
+
+
+class LaunchScreen:
+    """attract-mode screen, composed once into cached layers"""
+
+    def __init__(self, game):
+        self.screen = game.screen
+        self.settings = game.settings
+        self.screen_rect = self.screen.get_rect()
+        # Lengths below are in full-resolution pixels
+        self.px = px = self.settings.px
+
+        # Point table entries: (image, value text, color)
+        self.showcase = [
+            (assets.image('red_alien_1.png'), "= 40 PTS", (255, 0, 0)),
+            (assets.image('blue_alien_1.png'), "= 20 PTS", (0, 0, 255)),
+            (assets.image('green_alien_1.png'), "= 10 PTS", (0, 255, 0)),
+            (assets.image('pink_alien_1.png'), "= 30 PTS", (255, 0, 255)),
+            (assets.image('ufo.png'), "= ???", (255, 255, 255))
+        ]
+        # Move aliens to left side for better spacing
+        self.showcase_x = self.screen_rect.centerx - px(250)
+
+        # Retro-styled buttons with pixel edges
+        self.button_width = px(280)
+        self.button_height = px(50)
+        self.button_border = (0, 255, 0)
+        self.play_button = self._button_layout("PLAY GAME", px(460))
+        self.high_scores_button = self._button_layout("HIGH SCORES", px(520))
+
+        # Blinking "INSERT COIN" text at the bottom of the screen
+        self.coin_text = fonts.render("INSERT COIN", 'Courier New', px(24), (255, 255, 0))
+        self.coin_rect = self.coin_text.get_rect(centerx=self.screen_rect.centerx, y=px(620))
+
+        # Everything that never moves is drawn once
+        self.starfield = self._build_starfield()
+        self.background = self._build_background()
+
+    def _button_layout(self, text, y):
+        """text image, text rect and button rect, in the game's button format"""
+        button_rect = pygame.Rect(self.screen_rect.centerx - self.button_width // 2,
+                                  y, self.button_width, self.button_height)
+        text_image = fonts.render(text, 'Courier New', self.px(36), (0, 255, 0))
+        return ((text_image, text_image.get_rect(center=button_rect.center)), button_rect)
+
+    def _build_starfield(self):
+        """persistent starfield layer, laid out from a fixed seed"""
+        starfield = pygame.Surface(self.screen_rect.size).convert()
+        starfield.fill((0, 0, 0))
+        rng = random.Random(STARFIELD_SEED)
+        for _ in range(100):
+            x = rng.randint(0, self.settings.screen_width)
+            y = rng.randint(0, self.settings.screen_height)
+            size = self.px(rng.randint(1, 3))
+            brightness = rng.randint(150, 255)
+            pygame.draw.circle(starfield, (brightness, brightness, brightness), (x, y), size)
+        return starfield
+
+    def _build_background(self):
+        """compose the static layers: stars, scanlines, title, border, point table, buttons"""
+        px = self.px
+        background = self.starfield.copy()
+        width, height = self.screen_rect.size
+
+        # Scan lines effect (retro CRT look)
+        for y in range(0, height, px(4)):
+            pygame.draw.line(background, (0, 0, 0), (0, y), (width, y), 1)
+
+        # Glowing classic logo, shadows first
+        for offset in range(1, 5):
+            glow_color = (0, min(50 + offset * 10, 255), min(50 + offset * 10, 255))
+            title_shadow = fonts.render("SPACE INVADERS", 'Courier New', px(80), glow_color,
+                                        bold=True)
+            background.blit(title_shadow, title_shadow.get_rect(centerx=self.screen_rect.centerx,
+                                                                y=px(80) - offset))
+        title_text = fonts.render("SPACE INVADERS", 'Courier New', px(80), (0, 255, 0), bold=True)
+        background.blit(title_text, title_text.get_rect(centerx=self.screen_rect.centerx,
+                                                        y=px(80)))
+
+        # Pixelated border around the screen (arcade cabinet style)
+        border_width = px(20)
+        pygame.draw.rect(background, (40, 40, 40), (0, 0, width, border_width))
+        pygame.draw.rect(background, (40, 40, 40), (0, height - border_width, width, border_width))
+        pygame.draw.rect(background, (40, 40, 40), (0, 0, border_width, height))
+        pygame.draw.rect(background, (40, 40, 40), (width - border_width, 0, border_width, height))
+
+        # Point values next to where each alien wobbles
+        for i, (image, value_str, color) in enumerate(self.showcase):
+            value_text = fonts.render(value_str, 'Courier New', px(30), color)
+            background.blit(value_text, (self.showcase_x + px(70), px(170) + i * px(50) + px(5)))
+
+        # Buttons with pixelated corners
+        corner_size = px(8)
+        for (text_image, text_rect), button_rect in (self.play_button, self.high_scores_button):
+            pygame.draw.rect(background, (0, 0, 0), button_rect, 0)
+            pygame.draw.rect(background, self.button_border, button_rect, px(3))
+            for corner in [(0, 0), (self.button_width - corner_size, 0),
+                           (0, self.button_height - corner_size),
+                           (self.button_width - corner_size, self.button_height - corner_size)]:
+                pygame.draw.rect(background, self.button_border,
+                                 (button_rect.x + corner[0], button_rect.y + corner[1],
+                                  corner_size, corner_size))
+            background.blit(text_image, text_rect)
+
+        # Retro copyright text
+        copyright_text = fonts.render("(C) 2025 ARCADE CLASSICS BY JARED+BRETT", 'Courier New',
+                                      px(16), (150, 150, 150))
+        background.blit(copyright_text, (px(20), height - px(30)))
+        return background
+
+    def draw(self, now, mouse_pos):
+        """draw the cached layers plus this frame's animated parts"""
+        px = self.px
+        self.screen.blit(self.background, (0, 0))
+
+        # Blink every half second
+        if now % 1000 < 500:
+            self.screen.blit(self.coin_text, self.coin_rect)
+
+        # Aliens wobble gently inside their pixel boxes
+        time_factor = now / 500
+        for i, (image, value_str, color) in enumerate(self.showcase):
+            x_pos = self.showcase_x + math.sin(time_factor + i) * px(3)
+            y_pos = px(170) + i * px(50)
+            alien_box = pygame.Rect(x_pos - px(10), y_pos - px(5), px(40), px(40))
+            pygame.draw.rect(self.screen, (30, 30, 30), alien_box)
+            pygame.draw.rect(self.screen, color, alien_box, 1)
+            self.screen.blit(image, (x_pos, y_pos))
+
+        # Flashing glow behind a hovered button: a filled rect, with the
+        # cached button drawn back over it
+        if now % 500 < 250:
+            for button in (self.play_button, self.high_scores_button):
+                button_rect = button[1]
+                if button_rect.collidepoint(mouse_pos):
+                    pygame.draw.rect(self.screen, (0, 200, 0), button_rect.inflate(px(10), px(10)), 0)
+                    self.screen.blit(self.background, button_rect, button_rect)
+
+    def next_redraw(self, now, mouse_pos):
+        """milliseconds until the next animation change is due"""
+        # Coin text blinks every half second
+        delay = 500 - now % 500
+
+        # The alien wobble is redrawn at the idle frame cap
+        if self.settings.menu_idle_fps:
+            delay = min(delay, 1000 // self.settings.menu_idle_fps)
+
+        # Hover glow flashes every quarter second
+        for button in (self.play_button, self.high_scores_button):
+            if button[1].collidepoint(mouse_pos):
+                delay = min(delay, 250 - now % 250)
+        return max(1, delay)
@@ -0,0 +1,118 @@
+"""Game state exported as NumPy arrays, for bots and analysis tools.
+
+Two outputs, both built on preallocated arrays:
+
+- frame(): a zero-copy view of the display surface (via pygame.surfarray),
+  optionally downsampled by striding. The view locks the display, so drop
+  every reference to it before the next frame is drawn.
+- update(): a packed (rows, FIELDS) int16 array of entity state, one row per
+  ship, alien, bullet, UFO and barrier, refilled in place every tick. The
+  fleet and projectile engines write their own rows (observe()), so the
+  NumPy engines copy slices of their arrays without a Python object per
+  entity.
+"""
+import numpy as np
+import pygame
+
+from bullet import ALIEN as ALIEN_SHOT, PLAYER as PLAYER_SHOT
+
+# Entity kinds (KIND column); empty rows are all zero
+EMPTY, SHIP, ALIEN, PLAYER_BULLET, ALIEN_BULLET, UFO, BARRIER = range(7)
+
+# Columns of the entity array. TYPE and STATE depend on the kind:
+#   ship:    TYPE = lives left,        STATE = exploding
+#   alien:   TYPE = point value,       STATE = dying
+#   UFO:     TYPE = point value,       STATE = showing its value (hit)
+#   barrier: TYPE = barrier index,     STATE = integrity in thousandths
+KIND, X, Y, WIDTH, HEIGHT, TYPE, STATE = range(7)
+FIELDS = 7
+
+
+MAX_ALIENS = 256
+MAX_ALIEN_BULLETS = 64
+
+
+def entity_shape(settings, max_aliens=MAX_ALIENS, max_alien_bullets=MAX_ALIEN_BULLETS):
+    """shape of the entity array for the given settings"""
+    rows = 1 + max_aliens + settings.bullets_allowed + max_alien_bullets + 1 + settings.bunker_count
+    return (rows, FIELDS)
+
+
+def frame_shape(settings, downsample=1):
+    """shape of a frame() view for the given settings"""
+    k = downsample
+    return (-(-settings.screen_width // k), -(-settings.screen_height // k), 3)
+
+
+class Observer:
+    """fills preallocated arrays with a game's frame and entity state"""
+
+    def __init__(self, game, downsample=1, max_aliens=MAX_ALIENS, max_alien_bullets=MAX_ALIEN_BULLETS):
+        self.game = game
+        self.downsample = downsample
+
+        # Fixed row ranges for each kind of entity
+        settings = game.settings
+        self.ship_row = 0
+        self.alien_rows = (1, 1 + max_aliens)
+        start = self.alien_rows[1]
+        self.bullet_rows = (start, start + settings.bullets_allowed)
+        start = self.bullet_rows[1]
+        self.alien_bullet_rows = (start, start + max_alien_bullets)
+        self.ufo_row = self.alien_bullet_rows[1]
+        start = self.ufo_row + 1
+        self.barrier_rows = (start, start + settings.bunker_count)
+
+        self.entities = np.zeros(entity_shape(settings, max_aliens, max_alien_bullets),
+                                 dtype=np.int16)
+        # Rows used last tick in each range, so only stale rows get cleared
+        self._used = {}
+
+    def frame(self):
+        """zero-copy (width, height, 3) view of the display, downsampled by striding"""
+        pixels = pygame.surfarray.pixels3d(self.game.screen)
+        if self.downsample > 1:
+            return pixels[::self.downsample, ::self.downsample]
+        return pixels
+
+    def update(self):
+        """refill the entity array in place and return it"""
+        game = self.game
+        entities = self.entities
+
+        ship = game.ship
+        entities[self.ship_row] = (SHIP, *ship.rect, ship.lives, ship.exploding)
+
+        # The fleet and projectile engines write their own rows, so array
+        # engines copy straight from their arrays
+        self._fill(self.alien_rows, ALIEN, game.aliens.observe)
+        self._fill(self.bullet_rows, PLAYER_BULLET, game.projectiles.observe, PLAYER_SHOT)
+        self._fill(self.alien_bullet_rows, ALIEN_BULLET, game.projectiles.observe, ALIEN_SHOT)
+
+        ufo = game.ufo
+        if ufo:
+            entities[self.ufo_row] = (UFO, *ufo.rect, ufo.point_value, ufo.showing_value)
+        else:
+            entities[self.ufo_row] = 0
+
+        self._fill(self.barrier_rows, BARRIER, self._observe_barriers)
+        return entities
+
+    def _observe_barriers(self, rows):
+        values = [(barrier.x, barrier.y, barrier.width, barrier.height,
+                   i, 1000 * barrier.integrity())
+                  for i, barrier in enumerate(self.game.barriers[:len(rows)])]
+        if values:
+            rows[:len(values)] = values
+        return len(values)
+
+    def _fill(self, rows, kind, observe, *args):
+        """have observe(*args, rows) write a row range's X to STATE columns,
+        then mark the rows written as kind and clear rows left over from last tick"""
+        start, end = rows
+        count = observe(*args, self.entities[start:end, X:])
+        self.entities[start:start + count, KIND] = kind
+        used = self._used.get(start, 0)
+        if used > count:
+            self.entities[start + count:start + used] = 0
+        self._used[start] = count
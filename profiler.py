@@ -0,0 +1,146 @@
+import json
+import time
+from collections import deque
+
+import fonts
+
+
+class FrameProfiler:
+    """times each phase of a frame, keeping rolling history and a trace
+
+    Phases are timed as laps: lap(name) charges the time since the last
+    lap (or mark) to name, so timing a phase costs one perf_counter call.
+    """
+
+    def __init__(self, history=300, trace_frames=600, enabled=True):
+        self.enabled = enabled
+        self.history = history
+        # Phase name -> milliseconds spent in it, one entry per frame
+        self.phases = {}
+        self.current = {}
+        # Counter name -> its value, one entry per frame it was counted in
+        self.counts = {}
+        self.current_counts = {}
+        # (name, start, duration) in seconds, for the Chrome trace
+        self.trace = deque(maxlen=trace_frames * 16)
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.frames = 0
+
+        # On-screen overlay
+        self.overlay_visible = False
+        self.overlay_lines = []
+        self.overlay_refresh = 30  # frames between overlay text updates
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = self.last = time.perf_counter()
+        self.current = {}
+        self.current_counts = {}
+
+    def mark(self):
+        """start timing from now without charging the gap to any phase"""
+        if self.enabled:
+            self.last = time.perf_counter()
+
+    def lap(self, name):
+        """charge the time since the last lap to name"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[name] = self.current.get(name, 0.0) + (now - self.last) * 1000
+        self.trace.append((name, self.last, now - self.last))
+        self.last = now
+
+    def count(self, name, value):
+        """add value to this frame's count of name, e.g. draw calls"""
+        if self.enabled:
+            self.current_counts[name] = self.current_counts.get(name, 0) + value
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current['frame'] = (now - self.frame_start) * 1000
+        self.trace.append(('frame', self.frame_start, now - self.frame_start))
+        for name, ms in self.current.items():
+            samples = self.phases.get(name)
+            if samples is None:
+                samples = self.phases[name] = deque(maxlen=self.history)
+            samples.append(ms)
+        for name, value in self.current_counts.items():
+            samples = self.counts.get(name)
+            if samples is None:
+                samples = self.counts[name] = deque(maxlen=self.history)
+            samples.append(value)
+        self.frames += 1
+        if self.overlay_visible and self.frames % self.overlay_refresh == 0:
+            self._update_overlay()
+
+    def summary(self):
+        """rolling p50/p95/p99, mean and max milliseconds for each phase"""
+        return self._percentiles(self.phases)
+
+    def count_summary(self):
+        """rolling p50/p95/p99, mean and max per frame of each counter"""
+        return self._percentiles(self.counts)
+
+    def _percentiles(self, series):
+        result = {}
+        for name, samples in series.items():
+            ordered = sorted(samples)
+            count = len(ordered)
+            result[name] = {
+                'p50': ordered[count // 2],
+                'p95': ordered[min(count - 1, count * 95 // 100)],
+                'p99': ordered[min(count - 1, count * 99 // 100)],
+                'mean': sum(ordered) / count,
+                'max': ordered[-1],
+            }
+        return result
+
+    def export_trace(self, path, extra=None):
+        """write the recent frames as a Chrome trace (chrome://tracing, Perfetto)
+
+        The rolling summary goes in the trace's otherData, with any extra
+        entries given.
+        """
+        events = []
+        for name, start, duration in self.trace:
+            events.append({
+                'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                'ts': start * 1e6, 'dur': duration * 1e6,
+            })
+        other = {'summary': self.summary(), 'counts': self.count_summary()}
+        other.update(extra or {})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': other}, f)
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self._update_overlay()
+
+    def _update_overlay(self):
+        summary = self.summary()
+        lines = [f"{'phase':<30}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, stats in summary.items():
+            lines.append(f"{name:<30}{stats['p50']:7.2f}{stats['p95']:7.2f}{stats['p99']:7.2f}")
+        for name, stats in self.count_summary().items():
+            lines.append(f"{name:<30}{stats['p50']:7.0f}{stats['p95']:7.0f}{stats['p99']:7.0f}")
+        # Rendered once per refresh, not every frame, and kept out of the
+        # text cache since the numbers rarely repeat
+        font = fonts.font('Courier New', 14)
+        self.overlay_lines = [font.render(line, True, (255, 255, 0), (0, 0, 0))
+                              for line in lines]
+
+    def draw_overlay(self, queue):
+        """queue the overlay to be drawn, if it is on"""
+        if not self.overlay_visible:
+            return
+        y = 60
+        for line in self.overlay_lines:
+            queue.blit('overlay', line, (10, y))
+            y += line.get_height()
@@ -0,0 +1,118 @@
+"""Projectile engines.
+
+Every shot in play, the player's and the aliens', lives in one projectile
+store, which the game talks to through a small set of methods:
+
+- SpriteProjectiles: a sprite group of Bullet and AlienBullet objects
+- ArrayProjectiles (array_projectiles.py): preallocated NumPy arrays with
+  free-slot reuse, moved, culled and drawn in batches, for thousands of
+  projectiles at once
+
+Settings.projectile_engine picks one ('sprites' or 'numpy'). Both give
+exactly the same game, tick for tick, so replays play back the same on
+either.
+
+Stores fill the collision world's 'bullets' and 'alien_bullets' layers
+with a key per projectile; projectile(key) gives back something that
+moves, dies and collides like a Bullet.
+"""
+from operator import attrgetter
+
+from pygame.sprite import Group
+
+from bullet import ALIEN, PLAYER, AlienBullet, Bullet
+
+# The collision world layer of each owner's projectiles
+LAYERS = {PLAYER: 'bullets', ALIEN: 'alien_bullets'}
+
+
+class SpriteProjectiles(Group):
+    """projectiles as a sprite group, one Bullet or AlienBullet per shot"""
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+        for layer in LAYERS.values():
+            game.collisions.use_masks(layer, attrgetter('mask'))
+
+    def fire(self, owner, shooter):
+        """add a projectile fired by the ship (PLAYER) or an alien (ALIEN)"""
+        if owner == PLAYER:
+            self.add(Bullet(self.game))
+        else:
+            self.add(AlienBullet(self.game, shooter))
+
+    def sprites(self, owner=None):
+        """the projectiles in the order they were fired, optionally one owner's"""
+        sprites = super().sprites()
+        if owner is None:
+            return sprites
+        return [bullet for bullet in sprites if bullet.owner == owner]
+
+    def count(self, owner):
+        return len(self.sprites(owner))
+
+    def empty(self, owner=None):
+        """remove every projectile, or every projectile of one owner"""
+        if owner is None:
+            super().empty()
+        else:
+            self.remove(*self.sprites(owner))
+
+    def update(self):
+        """move every projectile, dropping those whose whole path is off the screen"""
+        super().update()
+        screen_height = self.game.settings.screen_height
+        for bullet in self.sprites():
+            if bullet.owner == PLAYER and bullet.path.bottom <= 0:
+                self.remove(bullet)
+            elif bullet.owner == ALIEN and bullet.path.top >= screen_height:
+                self.remove(bullet)
+
+    def observe(self, owner, rows):
+        """write one owner's projectiles as (x, y, width, height, 0, 0) into the
+        rows of an int16 array, returning how many rows were written"""
+        values = [(*bullet.rect, 0, 0) for bullet in self.sprites(owner)[:len(rows)]]
+        if values:
+            rows[:len(values)] = values
+        return len(values)
+
+    def store_previous_positions(self):
+        for bullet in self.sprites():
+            bullet.prev_rect = bullet.rect.copy()
+
+    def sync_collisions(self):
+        """refill the collision world's projectile layers with every path"""
+        world = self.game.collisions
+        for owner, layer in LAYERS.items():
+            world.clear(layer)
+            world.add_all(layer, ((bullet, bullet.path) for bullet in self.sprites(owner)))
+
+    def projectile(self, key):
+        """the projectile behind a collision key"""
+        return key
+
+    def draw_projectiles(self, queue, alpha=1.0):
+        """queue every projectile alpha of the way from its previous position"""
+        render_rect = self.game._render_rect
+        # The player's shots first, then the aliens'
+        for owner in (PLAYER, ALIEN):
+            bullets = self.sprites(owner)
+            if not bullets:
+                continue
+            # Every projectile of an owner is the same size and color, so
+            # one solid surface draws them all
+            image = queue.solid(bullets[0].color, bullets[0].rect.size)
+            queue.blits('projectiles', [(image, render_rect(bullet, alpha)) for bullet in bullets])
+
+
+def make_projectiles(game):
+    """an empty projectile store using the engine chosen in the game's settings"""
+    engine = game.settings.projectile_engine
+    if engine == 'sprites':
+        return SpriteProjectiles(game)
+    if engine == 'numpy':
+        # NumPy is only needed when this engine is used
+        from array_projectiles import ArrayProjectiles
+        return ArrayProjectiles(game)
+    raise ValueError(f"unknown projectile engine {engine!r}")
@@ -0,0 +1,109 @@
+import struct
+import zlib
+
+from settings import PIXEL_SIZES, TICK_RATES
+
+MAGIC = b'SIRP'
+# Bumped whenever the same inputs would play a different game
+VERSION = 3
+
+# magic, version, seed, tick rate, pixel size, ticks, score
+HEADER = struct.Struct('<4sBQHBII')
+
+
+class Replay:
+    """a recorded game: the seed plus one input byte per simulation tick
+
+    On disk the inputs are run-length encoded (held controls repeat for
+    many ticks) and zlib-compressed, so a whole session is a few KB.
+    """
+
+    def __init__(self, seed, tick_rate, inputs=None, score=0, pixel_size=1):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        # The screen's pixel size changes the game, so it is recorded too
+        self.pixel_size = pixel_size
+        self.inputs = bytearray(inputs or b'')
+        self.score = score
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def record(self, state):
+        """append the input state for the next tick"""
+        self.inputs.append(state)
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.tick_rate, self.pixel_size,
+                             len(self.inputs), self.score)
+        return header + zlib.compress(_encode_runs(self.inputs), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("not a Space Invaders replay")
+        magic, version, seed, tick_rate, pixel_size, ticks, score = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a Space Invaders replay")
+        if tick_rate not in TICK_RATES:
+            raise ValueError(f"unsupported tick rate {tick_rate}")
+        if pixel_size not in PIXEL_SIZES:
+            raise ValueError(f"unsupported pixel size {pixel_size}")
+        try:
+            inputs = _decode_runs(zlib.decompress(data[HEADER.size:]))
+        except (zlib.error, IndexError):
+            raise ValueError("replay data is corrupt")
+        if len(inputs) != ticks:
+            raise ValueError("replay is truncated")
+        return cls(seed, tick_rate, inputs, score, pixel_size)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def controller(self):
+        """an input source that plays the recorded inputs back (see controls.py)"""
+        inputs = self.inputs
+        return lambda game, tick: inputs[tick] if tick < len(inputs) else 0
+
+
+def _encode_runs(inputs):
+    """(state byte, run length as a varint) for each run of equal states"""
+    out = bytearray()
+    i = 0
+    while i < len(inputs):
+        state = inputs[i]
+        end = i + 1
+        while end < len(inputs) and inputs[end] == state:
+            end += 1
+        out.append(state)
+        run = end - i
+        while run >= 0x80:
+            out.append((run & 0x7F) | 0x80)
+            run >>= 7
+        out.append(run)
+        i = end
+    return bytes(out)
+
+
+def _decode_runs(data):
+    inputs = bytearray()
+    i = 0
+    while i < len(data):
+        state = data[i]
+        i += 1
+        run = shift = 0
+        while True:
+            byte = data[i]
+            i += 1
+            run |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        inputs.extend(bytes((state,)) * run)
+    return inputs
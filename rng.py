@@ -0,0 +1,22 @@
+import random
+
+
+class RandomStreams:
+    """independent seeded random streams, one per game system
+
+    Each system draws from its own stream so that, for a given seed and
+    the same per-tick input, a game plays out exactly the same way.
+    """
+
+    NAMES = ('alien_fire', 'ufo', 'ufo_points', 'barrier')
+
+    def __init__(self, seed=None):
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """restart every stream from seed (a fresh random seed if None)"""
+        if seed is None:
+            seed = random.randrange(2**63)
+        self.seed = seed % 2**64
+        for name in self.NAMES:
+            setattr(self, name, random.Random(f'{self.seed}:{name}'))
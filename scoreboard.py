@@ -1,7 +1,9 @@
-import pygame.font
 import json
 import os
 
+import assets
+import fonts
+
 class Scoreboard:
     
     def __init__(self, ai_game):
@@ -13,7 +15,20 @@ class Scoreboard:
         
         # Font settings for scoring information
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont('Arial', 48)
+        self.font_face = 'Arial'
+        self.font_size = self.settings.px(48)
+        # Every glyph the scores are made of, rendered once
+        self.atlas = fonts.GlyphAtlas(self.font_face, self.font_size, self.text_color,
+                                      self.settings.bg_color, labels=('HIGH: ',))
+        
+        # The value each field was last composed for
+        self.shown_score = self.shown_high_score = self.shown_ships = None
+        self.score_image = self.high_score_image = None
+        # Whether the high score has changed since it was last saved
+        self.high_score_unsaved = False
+        
+        # The saved high score is read once, not every time it is shown
+        self._load_high_score()
         
         # Prepare the initial score images
         self.prep_score()
@@ -21,70 +36,82 @@ class Scoreboard:
         self.prep_ships()
     
     def prep_score(self):
-        """turn the score into a rendered image"""
+        """compose the score from the glyph atlas, if it has changed"""
         rounded_score = round(self.stats.score, -1)
-        score_str = "{:,}".format(rounded_score)
-        self.score_image = self.font.render(score_str, True,
-                                            self.text_color, self.settings.bg_color)
+        if rounded_score == self.shown_score:
+            return
+        self.shown_score = rounded_score
+        # Composed over the last score's image while the width stays the same
+        self.score_image = self.atlas.compose("{:,}".format(rounded_score), self.score_image)
         
         # Display the score at the top right of the screen
         self.score_rect = self.score_image.get_rect()
-        self.score_rect.right = self.screen_rect.right - 20
-        self.score_rect.top = 20
+        self.score_rect.right = self.screen_rect.right - self.settings.px(20)
+        self.score_rect.top = self.settings.px(20)
     
     def prep_high_score(self):
-        """turn the high score into a rendered image"""
-        # Load high score from file if it exists
-        self._load_high_score()
-        
+        """compose the high score from the glyph atlas, if it has changed"""
         high_score = round(self.stats.high_score, -1)
-        high_score_str = "HIGH: {:,}".format(high_score)
-        self.high_score_image = self.font.render(high_score_str, True,
-                                                self.text_color, self.settings.bg_color)
+        if high_score == self.shown_high_score:
+            return
+        self.shown_high_score = high_score
+        parts = ['HIGH: ', *"{:,}".format(high_score)]
+        self.high_score_image = self.atlas.compose(parts, self.high_score_image)
         
         # Center the high score at the top of the screen
         self.high_score_rect = self.high_score_image.get_rect()
         self.high_score_rect.centerx = self.screen_rect.centerx
-        self.high_score_rect.top = self.score_rect.top
+        self.high_score_rect.top = self.settings.px(20)
     
     def prep_ships(self):
         """show how many ships are left"""
+        if self.stats.ships_left == self.shown_ships:
+            return
+        self.shown_ships = self.stats.ships_left
         self.ships = []
+        ship = assets.image('ship.png')
+        margin = self.settings.px(10)
         for ship_number in range(self.stats.ships_left):
-            ship = pygame.image.load('images/ship.png')
             ship_rect = ship.get_rect()
-            ship_rect.x = 10 + ship_number * (ship_rect.width + 10)
-            ship_rect.y = 10
+            ship_rect.x = margin + ship_number * (ship_rect.width + margin)
+            ship_rect.y = margin
             self.ships.append((ship, ship_rect))
     
-    def show_score(self):
-        """draw scores and ships to the screen"""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
+    def show_score(self, queue):
+        """queue scores and ships to be drawn"""
+        queue.blit('hud', self.score_image, self.score_rect)
+        queue.blit('hud', self.high_score_image, self.high_score_rect)
         
         # Draw ships
-        for ship, ship_rect in self.ships:
-            self.screen.blit(ship, ship_rect)
+        queue.blits('hud', self.ships)
     
     def check_high_score(self):
         """check to see if there's a new high score"""
         if self.stats.score > self.stats.high_score:
             self.stats.high_score = self.stats.score
             self.prep_high_score()
-            self._save_high_score()
+            # Saved once the game is over, not in the middle of a frame
+            self.high_score_unsaved = True
+    
+    def save_high_score(self):
+        """save the high score to a file, if it has changed"""
+        if not self.high_score_unsaved:
+            return
+        self.high_score_unsaved = False
+        if not self.stats.persist:
+            return
+        with open('high_score.json', 'w') as f:
+            json.dump(self.stats.high_score, f)
     
     def _load_high_score(self):
         """load high score from a file"""
+        if not self.stats.persist:
+            return
         try:
             with open('high_score.json', 'r') as f:
                 self.stats.high_score = json.load(f)
         except FileNotFoundError:
             self.stats.high_score = 0
-    
-    def _save_high_score(self):
-        """save high score to a file"""
-        with open('high_score.json', 'w') as f:
-            json.dump(self.stats.high_score, f)
 
 class GameStats:
     
@@ -93,6 +120,9 @@ class GameStats:
         self.settings = ai_game.settings
         self.reset_stats()
         
+        # Headless simulations must not touch the saved scores
+        self.persist = not ai_game.headless
+        
         # Start game in an inactive state
         self.game_active = False
         
@@ -124,5 +154,7 @@ class GameStats:
         # Keep only top 10
         self.high_scores = self.high_scores[:10]
         # Save to file
+        if not self.persist:
+            return
         with open('high_scores.json', 'w') as f:
             json.dump(self.high_scores, f)
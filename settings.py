@@ -6,41 +6,69 @@ PINK = (255, 0, 255)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 
+# Simulation tick rates and screen pixel sizes the game supports
+TICK_RATES = range(1, 1001)
+PIXEL_SIZES = range(1, 9)
+
 
 class Settings:
-    def __init__(self):
+    def __init__(self, pixel_size=1):
+        # Screen pixels per logical pixel. The game is laid out, simulated and
+        # drawn in logical pixels, at 1/pixel_size of the full resolution, and
+        # SDL scales each frame up to the window (see px())
+        self.pixel_size = pixel_size
+        
+        # Simulation timing. Speeds below are in pixels per 1/60 s and
+        # alien_firing_rate/ufo_appearance_rate are per 1/60 s too
+        self.set_tick_rate(60)
+        self.max_catchup_ticks = 5  # Most ticks run per frame before dropping time
+        self.render_interpolation = True  # Draw sprites between simulation states
+        self.dirty_rendering = False  # Redraw and present only what changed during gameplay
+        self.fps_limit = 60  # Display frame rate cap
+        self.fleet_engine = 'sprites'  # 'sprites', or 'numpy' for very large fleets
+        self.projectile_engine = 'sprites'  # 'sprites', or 'numpy' for thousands of bullets
+        self.collision_cell_size = self.px(64)  # Pixels per side of a collision world grid cell
+        self.pixel_collisions = True  # Confirm rect hits against sprite masks
+        
         # Screen settings
-        self.screen_width = 1280
-        self.screen_height = 720
+        self.screen_width = self.px(1280)
+        self.screen_height = self.px(720)
+        self.fullscreen = False  # Scale the screen up to the whole display
         self.bg_color = BLACK
         
         # Ship settings
         self.ship_limit = 3  # Amount of lives player can have
-        self.ship_speed = 3.5
+        self.ship_speed = 3.5 / pixel_size
         
         # Bullet settings
-        self.bullet_speed = 7.0
-        self.bullet_width = 3
-        self.bullet_height = 15
+        self.bullet_speed = 7.0 / pixel_size
+        self.bullet_width = self.px(3)
+        self.bullet_height = self.px(15)
         self.bullet_color = WHITE
         self.bullets_allowed = 3
         
         # Alien settings
-        self.alien_speed = 1.0
-        self.fleet_drop_speed = 10
+        self.alien_speed = 1.0 / pixel_size
+        self.fleet_drop_speed = self.px(10)
         self.fleet_direction = 1  # 1 represents right; -1 represents left
         
         # Alien bullet settings
-        self.alien_bullet_speed = 3.0
-        self.alien_bullet_width = 3
-        self.alien_bullet_height = 15
+        self.alien_bullet_speed = 3.0 / pixel_size
+        self.alien_bullet_width = self.px(3)
+        self.alien_bullet_height = self.px(15)
         self.alien_bullet_color = WHITE
         self.alien_firing_rate = 0.0005  # Probability of an alien firing per frame
         
         # UFO settings
-        self.ufo_speed = 2.0
+        self.ufo_speed = 2.0 / pixel_size
         self.ufo_appearance_rate = 0.001  # Probability of UFO appearing per frame
         
+        # Menu settings
+        self.menu_idle_fps = 15  # Redraw cap for menu animations (0 = only on input and blinks)
+        
+        # Sound settings
+        self.sound_channels = 8  # Mixer channels reserved for sound effects
+        
         # Bunker settings
         self.bunker_count = 4
         
@@ -51,10 +79,22 @@ class Settings:
         # How quickly the alien point values increase
         self.initialize_dynamic_settings()
         
+    def set_tick_rate(self, tick_rate):
+        """run the simulation at tick_rate fixed steps per second"""
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000 / tick_rate
+        # Scales per-1/60 s speeds and chances to a single tick
+        self.motion_scale = 60 / tick_rate
+    
+    def px(self, length):
+        """a length in full-resolution pixels, in logical pixels"""
+        return max(1, round(length / self.pixel_size))
+        
     def initialize_dynamic_settings(self):
         self.ship_speed_factor = 1.5
         self.bullet_speed_factor = 3.0
         self.alien_speed_factor = 1.0
+        self.alien_speed = 1.0 / self.pixel_size
         self.fleet_direction = 1
         self.alien_points = 50
         
@@ -65,4 +105,4 @@ class Settings:
         # Adjust speed inversely to the percentage of aliens remaining
         # The fewer aliens, the faster they move
         if percentage_remaining < 0.75:
-            self.alien_speed = 1.0 * (1.0 + (0.75 - percentage_remaining) * 3)
+            self.alien_speed = 1.0 * (1.0 + (0.75 - percentage_remaining) * 3) / self.pixel_size
@@ -1,15 +1,18 @@
-import pygame
 from pygame.sprite import Sprite
 
+import assets
+
 class Ship(Sprite):
     def __init__(self, ai_game):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
+        self.sounds = ai_game.sounds
         self.screen_rect = ai_game.screen.get_rect()
         
         # Load the ship image and get its rect
-        self.image = pygame.image.load('images/ship.png')
+        self.ship_image = assets.image('ship.png')
+        self.image = self.ship_image
         self.rect = self.image.get_rect()
         
         # Start each new ship at the bottom center of the screen
@@ -18,6 +21,8 @@ class Ship(Sprite):
         # Store decimal positions for the ship's horizontal and vertical positions
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
+        # Where the ship was at the start of the tick, for interpolation
+        self.prev_rect = self.rect.copy()
         
         # Movement flags
         self.moving_right = False
@@ -29,15 +34,14 @@ class Ship(Sprite):
         self.lives = self.settings.ship_limit
         self.exploding = False
         self.explosion_frame = 0
-        self.explosion_frames = []
+        self.explosion_frames = assets.ship_explosion_frames()  # 8 frames of explosion
         self.explosion_time = 0
         self.explosion_speed = 100  # milliseconds between explosion frames
-        
-        # Load explosion animation frames
-        for i in range(1, 9):  # 8 frames of explosion
-            self.explosion_frames.append(
-                pygame.image.load(f'images/ship_explosion_{i}.png')
-            )
+    
+    @property
+    def mask(self):
+        """collision mask of the current frame"""
+        return assets.mask(self.image, self.rect.size)
     
     def update(self, time_delta=None):
         """Update the ship's position based on movement flags."""
@@ -51,31 +55,42 @@ class Ship(Sprite):
                     self.image = self.explosion_frames[self.explosion_frame]
                 else:
                     self.exploding = False
-                    self.image = pygame.image.load('images/ship.png')
+                    self.image = self.ship_image
                     self.center_ship()
         
         # Movement updates (only if not exploding)
         if not self.exploding:
+            speed = self.settings.ship_speed * self.settings.motion_scale
             # Update horizontal position
             if self.moving_right and self.rect.right < self.screen_rect.right:
-                self.x += self.settings.ship_speed
+                self.x += speed
             if self.moving_left and self.rect.left > 0:
-                self.x -= self.settings.ship_speed
+                self.x -= speed
                 
             # Update vertical position (with boundaries to keep ship in lower portion)
             if self.moving_up and self.rect.top > self.screen_rect.height * 0.7:  # Upper boundary
-                self.y -= self.settings.ship_speed
+                self.y -= speed
             if self.moving_down and self.rect.bottom < self.screen_rect.bottom:
-                self.y += self.settings.ship_speed
+                self.y += speed
             
             # Update rect object from position variables
             self.rect.x = self.x
             self.rect.y = self.y
     
+    def reset(self):
+        """get a fresh ship with a full set of lives"""
+        self.lives = self.settings.ship_limit
+        self.exploding = False
+        self.explosion_frame = 0
+        self.explosion_time = 0
+        self.image = self.ship_image
+        self.center_ship()
+    
     def center_ship(self):
         self.rect.midbottom = self.screen_rect.midbottom
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
+        self.prev_rect = self.rect.copy()
         
         # Reset movement flags
         self.moving_right = False
@@ -83,8 +98,8 @@ class Ship(Sprite):
         self.moving_up = False
         self.moving_down = False
     
-    def blitme(self):
-        self.screen.blit(self.image, self.rect)
+    def blitme(self, queue, rect=None):
+        queue.blit('ship', self.image, rect or self.rect)
         
     def explode(self):
         if not self.exploding:
@@ -93,7 +108,7 @@ class Ship(Sprite):
             self.explosion_time = 0
             self.image = self.explosion_frames[0]
             # Play explosion sound
-            pygame.mixer.Sound('sounds/ship_explosion.mp3').play()
+            self.sounds.play('ship_explosion')
             
             # Decrement lives
             self.lives -= 1
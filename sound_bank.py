@@ -0,0 +1,101 @@
+import time
+import pygame
+
+SOUND_DIR = 'sounds'
+
+# Effect name -> maximum number of voices that may play it at once
+EFFECTS = {
+    'laser': 2,
+    'explosion': 2,
+    'alien_explosion': 3,
+    'ship_explosion': 1,
+    'ufo_sound': 1,
+    'ufo_explosion': 1,
+}
+
+
+class SoundBank:
+    """decodes every sound effect once and plays them on reserved channels"""
+
+    def __init__(self, settings, enabled=True):
+        self.enabled = enabled and pygame.mixer.get_init() is not None
+        self.sounds = {}
+        self.channels = []
+        # Which effect each pooled channel was last given, and when
+        self.voices = {}
+
+        # Per-frame dispatch cost (milliseconds)
+        self.frame_cost = 0.0
+        self.last_frame_cost = 0.0
+        self.peak_frame_cost = 0.0
+        self.plays = 0
+        self.dropped = 0
+
+        if not self.enabled:
+            return
+
+        # Decode every effect up front so nothing is decoded mid-frame
+        for name in EFFECTS:
+            self.sounds[name] = pygame.mixer.Sound(f'{SOUND_DIR}/{name}.mp3')
+
+        # Reserve a fixed pool of channels for effects
+        pool_size = settings.sound_channels
+        if pygame.mixer.get_num_channels() < pool_size:
+            pygame.mixer.set_num_channels(pool_size)
+        pygame.mixer.set_reserved(pool_size)
+        self.channels = [pygame.mixer.Channel(i) for i in range(pool_size)]
+
+    def play(self, name, loops=0):
+        """play an effect, returning the channel it was given (or None)"""
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+
+        channel = self._find_channel(name)
+        if channel is None:
+            self.dropped += 1
+        else:
+            channel.play(self.sounds[name], loops)
+            self.voices[channel] = (name, start)
+            self.plays += 1
+
+        self.frame_cost += (time.perf_counter() - start) * 1000
+        return channel
+
+    def stop(self, channel, name):
+        """stop a voice previously returned by play() for this effect"""
+        # The channel may have been handed to another effect since
+        if channel is not None and self.voices.get(channel, (None,))[0] == name:
+            channel.stop()
+            del self.voices[channel]
+
+    def _find_channel(self, name):
+        """pick a free pooled channel, respecting the effect's voice cap"""
+        playing = []
+        free = None
+        for channel in self.channels:
+            if not channel.get_busy():
+                if free is None:
+                    free = channel
+            elif self.voices.get(channel, (None,))[0] == name:
+                playing.append(channel)
+
+        # At the cap: restart this effect's oldest voice instead of stacking
+        if len(playing) >= EFFECTS[name]:
+            return min(playing, key=lambda channel: self.voices[channel][1])
+        return free
+
+    def end_frame(self):
+        """close out this frame's audio dispatch cost"""
+        self.last_frame_cost = self.frame_cost
+        self.peak_frame_cost = max(self.peak_frame_cost, self.frame_cost)
+        self.frame_cost = 0.0
+
+    def report(self):
+        """summary of audio dispatch cost and voice usage"""
+        return {
+            'last_frame_ms': self.last_frame_cost,
+            'peak_frame_ms': self.peak_frame_cost,
+            'plays': self.plays,
+            'dropped': self.dropped,
+        }
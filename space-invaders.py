@@ -1,27 +1,81 @@
+import argparse
+import json
+import math
+import os
 import pygame
 import sys
-import random
-import math
-from time import sleep
-from pygame.sprite import Group, groupcollide
+import time
+from operator import attrgetter
 
-from settings import Settings
+import assets
+import fonts
+from settings import PIXEL_SIZES, TICK_RATES, Settings
 from ship import Ship
-from bullet import Bullet, AlienBullet
+from bullet import ALIEN, PLAYER
 from aliens import Aliens, PinkAlien, BlueAlien, GreenAlien, RedAlien, UFO
 from barrier import Barrier
+from collisions import CollisionWorld
+from dirty import DirtyRects
+from render import RenderQueue
+from fleet import make_fleet
+from controls import LEFT, RIGHT, UP, DOWN, FIRE, make_controller
+from launch_screen import LaunchScreen
+from profiler import FrameProfiler
+from projectiles import make_projectiles
+from replay import Replay
+from rng import RandomStreams
 from scoreboard import Scoreboard, GameStats
+from sound_bank import SoundBank
+
+# Layer pairs tested for contacts every tick, in the order they are resolved
+CONTACT_PAIRS = (
+    ('ship', 'aliens'),
+    ('bullets', 'aliens'),
+    ('bullets', 'ufo'),
+    ('bullets', 'barriers'),
+    ('alien_bullets', 'ship'),
+    ('alien_bullets', 'barriers'),
+    ('bullets', 'alien_bullets'),
+)
+
+# What each kind of bullet stops at; only the first thing on its path counts
+BULLET_TARGETS = {
+    'bullets': ('aliens', 'ufo', 'barriers'),
+    'alien_bullets': ('ship', 'barriers'),
+}
 
 class SpaceInvaders:
     
-    def __init__(self):
+    def __init__(self, headless=False, render_every=0, pixel_size=1, fullscreen=False):
+        self.headless = headless
+        # In headless mode, draw only every Nth frame (0 = never)
+        self.render_every = render_every
+        if headless:
+            # SDL's dummy drivers need no window or audio device
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
         pygame.init()
         self.clock = pygame.time.Clock()
-        self.settings = Settings()
+        self.settings = Settings(pixel_size)
+        self.settings.fullscreen = fullscreen
+        
+        # Every random choice in the game draws from these seeded streams
+        self.random = RandomStreams()
         
         self.screen = pygame.display.set_mode(
-            (self.settings.screen_width, self.settings.screen_height))
+            (self.settings.screen_width, self.settings.screen_height), self._display_flags())
         pygame.display.set_caption("Space Invaders")
+        # What changed on screen since the last frame, for dirty rendering
+        self.dirty = DirtyRects(self.screen, self.settings.bg_color)
+        # Gameplay draw commands, drawn in one batch per frame
+        self.render_queue = RenderQueue(self.screen)
+        
+        # Load and convert every sprite image once, now that the display exists
+        assets.set_pixel_size(pixel_size)
+        assets.preload()
+        
+        # Decode every sound effect once, up front
+        self.sounds = SoundBank(self.settings, enabled=not headless)
         
         # Create an instance to store game statistics and create a scoreboard
         self.stats = GameStats(self)
@@ -29,17 +83,21 @@ class SpaceInvaders:
         
         # Initialize ship, bullets, and aliens
         self.ship = Ship(self)
-        self.bullets = Group()
-        self.alien_bullets = Group()
-        self.aliens = Group()
-        self.barriers = []
+        # Everything that can collide, bucketed by layer and grid cell
+        self.collisions = CollisionWorld(self.settings.collision_cell_size,
+                                         self.settings.pixel_collisions)
+        for layer in ('ship', 'ufo'):
+            self.collisions.use_masks(layer, attrgetter('mask'))
+        self.contacts = {}
         
-        # Sound effects
-        self.bullet_sound = pygame.mixer.Sound('sounds/laser.mp3')
-        self.explosion_sound = pygame.mixer.Sound('sounds/explosion.mp3')
+        # Every shot in play, the player's and the aliens'
+        self.projectiles = make_projectiles(self)
+        self.aliens = make_fleet(self)
+        self.barriers = []
         
         # Background music
-        pygame.mixer.music.load('sounds/background.mp3')
+        if self.sounds.enabled:
+            pygame.mixer.music.load('sounds/background.mp3')
         self.music_playing = False
         self.music_speed = 1.0
         
@@ -51,48 +109,317 @@ class SpaceInvaders:
         self.game_active = False
         self.current_screen = "launch"  # launch, game, high_scores
         
+        # Launch screen layers are composed once and reused every frame
+        self.launch_screen = LaunchScreen(self)
+        
         # Button images
-        self.play_button = self._create_button("PLAY GAME", (100, 400))
-        self.high_scores_button = self._create_button("HIGH SCORES", (100, 470))
-        self.back_button = self._create_button("BACK", (100, 600))
+        self.play_button = self.launch_screen.play_button
+        self.high_scores_button = self.launch_screen.high_scores_button
+        px = self.settings.px
+        self.back_button = self._create_button("BACK", (px(100), px(600)))
         
         # For tracking time between frames
         self.last_frame_time = pygame.time.get_ticks()
+        # Real time not yet simulated, in milliseconds
+        self.time_accumulator = 0
+        
+        # Milliseconds the game stays frozen after the ship is hit
+        self.hit_pause = 0
         
         # Initial alien count for scaling difficulty
         self.initial_alien_count = 0
         
+        # Input is sampled once per tick, from the keyboard unless an
+        # input source (a bot, script or replay) is driving the game
+        self.held_input = 0
+        self.fire_pressed = False
+        self.input_source = None
+        # Controls held on the previous tick (fire is edge triggered)
+        self.last_input = 0
+        
+        # Ticks simulated this game, and where to stop (None = no limit)
+        self.tick = 0
+        self.tick_limit = None
+        
+        # Record each game's inputs to this path ({seed} is filled in)
+        self.record_path = None
+        self.recording = None
+        
+        # Per-phase frame timings (F3 shows them), saved as a trace to
+        # profile_path on exit
+        self.profiler = FrameProfiler()
+        self.profile_path = None
+    
+    def _display_flags(self):
+        """set_mode flags: a low-resolution or full screen is scaled up by SDL"""
+        if self.headless:
+            # No window to scale to
+            return 0
+        flags = 0
+        if self.settings.pixel_size > 1 or self.settings.fullscreen:
+            # The screen surface stays at the logical size, and SDL scales
+            # each frame to the window in one step as it is presented
+            flags |= pygame.SCALED
+        if self.settings.fullscreen:
+            flags |= pygame.FULLSCREEN
+        return flags
+        
     def run_game(self):
         while True:
+            # Menu screens only redraw when something changes
+            if self.current_screen != "game":
+                self._run_menu_frame()
+                continue
+            
             # Calculate time delta between frames
             current_time = pygame.time.get_ticks()
-            time_delta = current_time - self.last_frame_time
+            frame_time = current_time - self.last_frame_time
             self.last_frame_time = current_time
             
+            self.profiler.begin_frame()
             self._check_events()
+            self.profiler.lap('events')
             
+            # How far between the last two simulation states to draw
+            alpha = 1.0
             if self.current_screen == "game" and self.game_active:
-                self.ship.update(time_delta)
-                self._update_bullets()
-                self._update_aliens(time_delta)
-                self._check_bullet_collisions()
-                self._check_alien_bullet_collisions()
-                self._update_ufo(time_delta)
-                self._fire_alien_bullets()
-                
-                # Update music speed based on aliens remaining
-                self._update_music_speed()
+                alpha = self._advance_simulation(frame_time)
+            
+            self.profiler.mark()
+            self._update_screen(alpha)
+            self.profiler.lap('render')
+            self.sounds.end_frame()
+            self.profiler.lap('sound')
+            self.profiler.end_frame()
+            self.clock.tick(self.settings.fps_limit)
+    
+    def _advance_simulation(self, frame_time, max_ticks=None):
+        """run the fixed ticks owed for frame_time, returning the leftover fraction"""
+        tick_ms = self.settings.tick_ms
+        if max_ticks is None:
+            max_ticks = self.settings.max_catchup_ticks
+        self.time_accumulator += frame_time
+        ticks = 0
+        while self.time_accumulator >= tick_ms and self.game_active:
+            if self.tick_limit is not None and self.tick >= self.tick_limit:
+                break
+            if ticks == max_ticks:
+                # Too far behind: drop the backlog instead of spiralling
+                self.time_accumulator %= tick_ms
+                break
+            self._update_game(tick_ms)
+            self.time_accumulator -= tick_ms
+            ticks += 1
+        return min(self.time_accumulator / tick_ms, 1.0)
+    
+    def run_headless(self, frames, controller, seed=None):
+        """simulate a game as fast as possible, returning a summary"""
+        self.input_source = controller
+        self._start_game(seed)
+        
+        # Every tick is the same length, whatever the wall clock does
+        time_delta = self.settings.tick_ms
+        start = time.perf_counter()
+        while self.tick < frames and self.game_active:
+            self.profiler.begin_frame()
+            self._update_game(time_delta)
+            if self.render_every and self.tick % self.render_every == 0:
+                self.profiler.mark()
+                self._update_screen()
+                self.profiler.lap('render')
+            self.profiler.end_frame()
+        elapsed = time.perf_counter() - start
+        frame = self.tick
+        self._save_recording()
+        self._save_profile()
+        
+        return {
+            'seed': self.random.seed,
+            'frames': frame,
+            'score': self.stats.score,
+            'ships_left': self.stats.ships_left,
+            'aliens_left': len(self.aliens),
+            'game_over': not self.game_active,
+            'seconds': round(elapsed, 3),
+            'fps': round(frame / elapsed, 1) if elapsed else None,
+        }
+    
+    def _update_game(self, time_delta):
+        """advance the game by one fixed tick"""
+        profiler = self.profiler
+        profiler.mark()
+        self._store_previous_positions()
+        self._apply_input(self._next_input())
+        self.tick += 1
+        profiler.lap('input')
+        
+        # The game is frozen for a moment after the ship is hit
+        if self.hit_pause > 0:
+            self.hit_pause -= time_delta
+            if self.hit_pause <= 0:
+                self._finish_ship_hit()
+            return
+        
+        self.ship.update(time_delta)
+        profiler.lap('ship')
+        self._update_bullets()
+        profiler.lap('bullets')
+        self._update_aliens(time_delta)
+        profiler.lap('aliens')
+        self._find_contacts()
+        profiler.lap('collision_world')
+        self._check_ship_collisions()
+        self._check_bullet_collisions()
+        profiler.lap('bullet_collisions')
+        self._check_alien_bullet_collisions()
+        profiler.lap('alien_bullet_collisions')
+        self._update_ufo(time_delta)
+        profiler.lap('ufo')
+        self._fire_alien_bullets()
+        profiler.lap('alien_fire')
+        
+        # Update music speed based on aliens remaining
+        self._update_music_speed()
+        profiler.lap('music')
+    
+    def _store_previous_positions(self):
+        """remember where everything was at the start of the tick"""
+        self.ship.prev_rect = self.ship.rect.copy()
+        self.projectiles.store_previous_positions()
+        self.aliens.store_previous_positions()
+        if self.ufo:
+            self.ufo.prev_rect = self.ufo.rect.copy()
+    
+    def _render_rect(self, sprite, alpha):
+        """where to draw a sprite between its previous and current tick"""
+        if alpha >= 1.0 or not self.settings.render_interpolation:
+            return sprite.rect
+        rect, prev = sprite.rect, sprite.prev_rect
+        return rect.move(round((prev.x - rect.x) * (1 - alpha)),
+                         round((prev.y - rect.y) * (1 - alpha)))
+    
+    def _next_input(self):
+        """this tick's input state, from the input source or the keyboard"""
+        if self.input_source:
+            state = self.input_source(self, self.tick)
+        else:
+            state = self.held_input
+            # A tap shorter than a tick still fires
+            if self.fire_pressed:
+                state |= FIRE
+                self.fire_pressed = False
+        
+        if self.recording is not None:
+            self.recording.record(state)
+        return state
+    
+    def start_replay(self, replay):
+        """reset to the start of a recorded game, driven by its inputs"""
+        if replay.pixel_size != self.settings.pixel_size:
+            raise ValueError(f"replay was recorded with pixel size {replay.pixel_size}")
+        self.settings.set_tick_rate(replay.tick_rate)
+        # Watching a replay must never touch the saved scores
+        self.stats.persist = False
+        self.record_path = None
+        self.input_source = replay.controller()
+        self._start_game(replay.seed)
+        self.tick_limit = len(replay)
+    
+    def fast_forward(self, tick):
+        """simulate without drawing until the given tick"""
+        while self.game_active and self.tick < tick:
+            if self.tick_limit is not None and self.tick >= self.tick_limit:
+                break
+            self._update_game(self.settings.tick_ms)
+    
+    def play_replay(self, replay, speed=1.0, seek=0):
+        """watch a recorded game at speed times real time, starting at tick seek"""
+        self.start_replay(replay)
+        self.fast_forward(seek)
+        
+        # Faster playback needs more ticks per frame
+        max_ticks = self.settings.max_catchup_ticks * math.ceil(speed)
+        self.last_frame_time = pygame.time.get_ticks()
+        while self.game_active and self.tick < self.tick_limit:
+            current_time = pygame.time.get_ticks()
+            frame_time = current_time - self.last_frame_time
+            self.last_frame_time = current_time
             
-            self._update_screen()
-            self.clock.tick(60)
+            self.profiler.begin_frame()
+            self._check_events()
+            self.profiler.lap('events')
+            alpha = self._advance_simulation(frame_time * speed, max_ticks)
+            self.profiler.mark()
+            self._update_screen(alpha)
+            self.profiler.lap('render')
+            self.sounds.end_frame()
+            self.profiler.lap('sound')
+            self.profiler.end_frame()
+            self.clock.tick(self.settings.fps_limit)
+        self._save_profile()
+    
+    def _save_recording(self):
+        """write the current game's recording, if one is being made"""
+        if self.recording is None:
+            return
+        self.recording.score = self.stats.score
+        self.recording.save(self.record_path.format(seed=self.recording.seed))
+        self.recording = None
+    
+    def _save_profile(self):
+        """write the profiler's trace, if a profile path was given"""
+        if self.profile_path:
+            self.profiler.export_trace(self.profile_path, {'sound': self.sounds.report()})
+    
+    def _quit(self):
+        # Save high score, recording and profile before quitting
+        if self.stats.score > 0:
+            self.stats.save_high_scores()
+        self.sb.save_high_score()
+        self._save_recording()
+        self._save_profile()
+        sys.exit()
+    
+    def _apply_input(self, state):
+        """drive the ship from a frame's input state (see controls.py)"""
+        self.ship.moving_left = bool(state & LEFT)
+        self.ship.moving_right = bool(state & RIGHT)
+        self.ship.moving_up = bool(state & UP)
+        self.ship.moving_down = bool(state & DOWN)
+        
+        # Fire on the press, like the space bar
+        if state & FIRE and not self.last_input & FIRE:
+            self._fire_bullet()
+        self.last_input = state
+    
+    def _run_menu_frame(self):
+        """wait for input or the next menu animation, then redraw once"""
+        # A timeout of 0 blocks until an event arrives
+        event = pygame.event.wait(self._menu_redraw_delay())
+        events = [] if event.type == pygame.NOEVENT else [event]
+        self._check_events(events + pygame.event.get())
+        
+        self._update_screen()
+        self.sounds.end_frame()
+        self.clock.tick(self.settings.fps_limit)
+        
+        # Don't let the time spent waiting count as a game frame
+        self.last_frame_time = pygame.time.get_ticks()
+    
+    def _menu_redraw_delay(self):
+        """milliseconds until the current menu screen next changes on its own"""
+        if self.current_screen == "launch":
+            return self.launch_screen.next_redraw(pygame.time.get_ticks(),
+                                                  pygame.mouse.get_pos())
+        # The high scores screen is static
+        return 0
     
-    def _check_events(self):
-        for event in pygame.event.get():
+    def _check_events(self, events=None):
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
-                # Save high score before quitting
-                if self.stats.score > 0:
-                    self.stats.save_high_scores()
-                sys.exit()
+                self._quit()
             elif event.type == pygame.KEYDOWN:
                 self._check_keydown_events(event)
             elif event.type == pygame.KEYUP:
@@ -106,33 +433,36 @@ class SpaceInvaders:
                     self._check_back_button(mouse_pos)
     
     def _check_keydown_events(self, event):
+        # Held controls are applied to the ship on the next tick
         if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = True
+            self.held_input |= RIGHT
         elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = True
+            self.held_input |= LEFT
         elif event.key == pygame.K_UP:
-            self.ship.moving_up = True
+            self.held_input |= UP
         elif event.key == pygame.K_DOWN:
-            self.ship.moving_down = True
+            self.held_input |= DOWN
         elif event.key == pygame.K_SPACE:
-            self._fire_bullet()
+            self.held_input |= FIRE
+            self.fire_pressed = True
         elif event.key == pygame.K_ESCAPE:
-            # Save high score before quitting
-            if self.stats.score > 0:
-                self.stats.save_high_scores()
-            sys.exit()
+            self._quit()
+        elif event.key == pygame.K_F3:
+            self.profiler.toggle_overlay()
         elif event.key == pygame.K_p and not self.game_active:
             self._start_game()
     
     def _check_keyup_events(self, event):
         if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = False
+            self.held_input &= ~RIGHT
         elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = False
+            self.held_input &= ~LEFT
         elif event.key == pygame.K_UP:
-            self.ship.moving_up = False
+            self.held_input &= ~UP
         elif event.key == pygame.K_DOWN:
-            self.ship.moving_down = False
+            self.held_input &= ~DOWN
+        elif event.key == pygame.K_SPACE:
+            self.held_input &= ~FIRE
     
     def _check_play_button(self, mouse_pos):
         button_rect = self.play_button[1]
@@ -149,7 +479,11 @@ class SpaceInvaders:
         if button_rect.collidepoint(mouse_pos):
             self.current_screen = "launch"
     
-    def _start_game(self):
+    def _start_game(self, seed=None):
+        # Every game starts from the same state, given its seed
+        self.random.reseed(seed)
+        self.settings.initialize_dynamic_settings()
+        
         # Reset the game statistics
         self.stats.reset_stats()
         self.stats.game_active = True
@@ -159,67 +493,72 @@ class SpaceInvaders:
         self.sb.prep_high_score()
         self.sb.prep_ships()
         
-        # Get rid of any remaining aliens and bullets
-        self.aliens.empty()
-        self.bullets.empty()
-        self.alien_bullets.empty()
+        # Simulation time starts fresh
+        self.time_accumulator = 0
+        self.hit_pause = 0
+        self.tick = 0
+        self.tick_limit = None
+        self.last_input = 0
+        self.fire_pressed = False
+        self.last_frame_time = pygame.time.get_ticks()
+        if self.record_path:
+            self.recording = Replay(self.random.seed, self.settings.tick_rate,
+                                    pixel_size=self.settings.pixel_size)
+        
+        # Get rid of any remaining aliens and bullets (the fleet and
+        # projectile engines may have changed in the settings since the
+        # last game)
+        self.aliens = make_fleet(self)
+        self.projectiles = make_projectiles(self)
         
-        # Create a new fleet and center the ship
+        if self.ufo:
+            self.sounds.stop(self.ufo.sound_channel, 'ufo_sound')
+            self.ufo = None
+        
+        # Create a new fleet and a fresh ship
         self._create_fleet()
-        self.ship.center_ship()
+        self.ship.reset()
         
         # Create barriers
         self._create_barriers()
         
         # Start background music
-        pygame.mixer.music.play(-1)  # -1 means loop indefinitely
-        self.music_playing = True
-        self.music_speed = 1.0
-        pygame.mixer.music.set_volume(0.5)
+        if self.sounds.enabled:
+            pygame.mixer.music.play(-1)  # -1 means loop indefinitely
+            self.music_playing = True
+            self.music_speed = 1.0
+            pygame.mixer.music.set_volume(0.5)
         
         # Hide the mouse cursor
         pygame.mouse.set_visible(False)
     
     def _fire_bullet(self):
-        if len(self.bullets) < self.settings.bullets_allowed and not self.ship.exploding:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
-            self.bullet_sound.play()
+        if (self.projectiles.count(PLAYER) < self.settings.bullets_allowed
+                and not self.ship.exploding):
+            self.projectiles.fire(PLAYER, self.ship)
+            self.sounds.play('laser')
     
     def _update_bullets(self):
-        # Update bullet positions
-        self.bullets.update()
-        self.alien_bullets.update()
-        
-        # Get rid of bullets that have disappeared
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
-        
-        for bullet in self.alien_bullets.copy():
-            if bullet.rect.top >= self.settings.screen_height:
-                self.alien_bullets.remove(bullet)
+        # Update bullet positions, getting rid of bullets that have left the screen
+        self.projectiles.update()
     
     def _fire_alien_bullets(self):
         # Randomly select aliens to fire
-        for alien in self.aliens.sprites():
-            # Random chance for each alien to fire
-            if random.random() < self.settings.alien_firing_rate:
-                new_bullet = AlienBullet(self, alien)
-                self.alien_bullets.add(new_bullet)
+        firing_chance = self.settings.alien_firing_rate * self.settings.motion_scale
+        for alien in self.aliens.firing(self.random.alien_fire, firing_chance):
+            self.projectiles.fire(ALIEN, alien)
     
     def _create_fleet(self):
-        # Create an alien and find the number of aliens in a row
+        # Find the number of aliens in a row
         # Spacing between each alien is equal to one alien width
-        pink_alien = PinkAlien(self, 0, 0)
-        alien_width, alien_height = pink_alien.rect.size
+        alien_width, alien_height = PinkAlien.size()
         available_space_x = self.settings.screen_width - (2 * alien_width)
         number_aliens_x = available_space_x // (2 * alien_width)
         
         # Determine the number of rows of aliens that fit on the screen
         ship_height = self.ship.rect.height
         available_space_y = (self.settings.screen_height -
-                             (3 * alien_height) - ship_height - 200)  # 200px buffer for barriers
+                             (3 * alien_height) - ship_height - self.settings.px(200))  # Room for barriers
         number_rows = available_space_y // (2 * alien_height)
         
         # Create the full fleet of aliens
@@ -239,53 +578,44 @@ class SpaceInvaders:
         self.initial_alien_count = len(self.aliens)
     
     def _create_alien(self, alien_class, alien_number, row_number):
-        sample_alien = alien_class(self, 0, 0)
-        alien_width, alien_height = sample_alien.rect.size
-        alien_width = alien_width
-        alien_height = alien_height
+        alien_width, alien_height = alien_class.size()
         
-        alien = alien_class(
-            self,
+        self.aliens.add_alien(
+            alien_class,
             alien_width + 2 * alien_width * alien_number,
-            alien_height + 2 * alien_height * row_number
+            alien_height + 2 * alien_height * row_number,
+            (row_number, alien_number)
         )
-        self.aliens.add(alien)
     
     def _create_barriers(self):
         self.barriers = []
+        self.collisions.clear('barriers')
         
         # Create evenly spaced barriers
         screen_width = self.settings.screen_width
         barrier_count = self.settings.bunker_count
         spacing = screen_width // (barrier_count + 1)
         
+        barrier_width = self.settings.px(Barrier.size[0])
         for i in range(barrier_count):
-            x_position = spacing * (i + 1) - 50  # Center barrier (width is 100)
+            x_position = spacing * (i + 1) - barrier_width // 2  # Center barrier
             barrier = Barrier(self, x_position)
             self.barriers.append(barrier)
+            self.collisions.add('barriers', barrier, barrier.rect)
     
     def _update_aliens(self, time_delta):
         self._check_fleet_edges()
         self.aliens.update(time_delta)
         
-        # Look for alien-ship collisions
-        if pygame.sprite.spritecollideany(self.ship, self.aliens) and not self.ship.exploding:
-            self._ship_hit()
-        
         # Look for aliens hitting the bottom of the screen
         self._check_aliens_bottom()
     
     def _check_fleet_edges(self):
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
+        if self.aliens.at_edge():
+            self._change_fleet_direction()
     
     def _change_fleet_direction(self):
-        for alien in self.aliens.sprites():
-            alien.y += self.settings.fleet_drop_speed
-            alien.rect.y = alien.y
-        
+        self.aliens.drop(self.settings.fleet_drop_speed)
         self.settings.fleet_direction *= -1
     
     def _update_ufo(self, time_delta):
@@ -297,15 +627,18 @@ class SpaceInvaders:
                 self.ufo = None
         
         # Randomly create new UFO
-        if not self.ufo and random.random() < self.settings.ufo_appearance_rate:
+        appearance_chance = self.settings.ufo_appearance_rate * self.settings.motion_scale
+        if not self.ufo and self.random.ufo.random() < appearance_chance:
             self.ufo = UFO(self)
             # Randomly choose direction (left to right or right to left)
-            if random.choice([True, False]):
+            if self.random.ufo.choice([True, False]):
                 self.ufo.direction = 1
                 self.ufo.rect.x = -self.ufo.rect.width
             else:
                 self.ufo.direction = -1
                 self.ufo.rect.x = self.settings.screen_width
+            self.ufo.x = float(self.ufo.rect.x)
+            self.ufo.prev_rect = self.ufo.rect.copy()
     
     def _update_music_speed(self):
         """update the music speed based on number of aliens remaining"""
@@ -326,12 +659,17 @@ class SpaceInvaders:
     
     def _ship_hit(self):
         """respond to the ship being hit by an alien"""
+        if self.hit_pause > 0:
+            return
+        
         # Start ship explosion animation
         self.ship.explode()
         
-        # Pause the game briefly
-        sleep(0.5)
-        
+        # Pause the game briefly, counted in simulation time
+        self.hit_pause = 500
+    
+    def _finish_ship_hit(self):
+        """carry on once the pause after a ship hit is over"""
         # Decrement ships_left
         self.stats.ships_left = self.ship.lives
         self.sb.prep_ships()
@@ -341,7 +679,7 @@ class SpaceInvaders:
             self.ship.center_ship()
             
             # Clear alien bullets
-            self.alien_bullets.empty()
+            self.projectiles.empty(ALIEN)
         else:
             self.game_active = False
             self.current_screen = "launch"
@@ -353,28 +691,91 @@ class SpaceInvaders:
                 self.music_playing = False
             
             # Save high score
+            self.sb.save_high_score()
             self.stats.save_high_scores()
+            self._save_recording()
     
     def _check_aliens_bottom(self):
-        screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom:
-                # Treat this the same as if the ship got hit
-                self._ship_hit()
-                break
+        if self.aliens.reached(self.screen.get_rect().bottom):
+            # Treat this the same as if the ship got hit
+            self._ship_hit()
+    
+    def _find_contacts(self):
+        """refresh the collision world and find this tick's contacts"""
+        world = self.collisions
+        # Free-moving layers are refilled; the fleet's and the barriers'
+        # layers are kept up to date as they change
+        for layer in ('ship', 'ufo'):
+            world.clear(layer)
+        world.add('ship', self.ship, self.ship.rect)
+        # Bullets are tested along their path, so fast ones can't skip a target
+        self.projectiles.sync_collisions()
+        if self.ufo:
+            world.add('ufo', self.ufo, self.ufo.rect)
+        self.aliens.sync_collisions()
+        self.contacts = world.query(CONTACT_PAIRS)
+        for layer, targets in BULLET_TARGETS.items():
+            self._keep_first_contacts(layer, targets)
+    
+    def _keep_first_contacts(self, layer, targets):
+        """drop each bullet's contacts beyond the first target on its path
+        
+        Targets the bullet meets at the same point are all kept, and resolved
+        in CONTACT_PAIRS order as usual.
+        """
+        rising = layer == 'bullets'
+        reaches = {}
+        first = {}
+        for target in targets:
+            pair = (layer, target)
+            reaches[pair] = []
+            for bullet_key, key in self.contacts[pair]:
+                bullet = self.projectiles.projectile(bullet_key)
+                rect = self._target_rect(target, key, bullet, rising)
+                reach = bullet.reach(rect) if rect else float('inf')
+                reaches[pair].append(reach)
+                first[bullet_key] = min(first.get(bullet_key, reach), reach)
+        for pair, pair_reaches in reaches.items():
+            self.contacts[pair] = [contact for contact, reach in zip(self.contacts[pair], pair_reaches)
+                                   if reach <= first[contact[0]]]
+    
+    def _target_rect(self, layer, key, bullet, rising):
+        """the part of a collision target a bullet's path runs into"""
+        if layer == 'aliens':
+            return self.aliens.alien(key).rect
+        if layer == 'barriers':
+            # The first standing cell on the path, if any
+            return key.contact(bullet.path, rising)
+        return key.rect
+    
+    def _live_contacts(self, pair):
+        """{bullet: [things it touches]} for a pair's bullets still in play"""
+        found = {}
+        for a, b in self.contacts[pair]:
+            found.setdefault(a, []).append(b)
+        projectile = self.projectiles.projectile
+        return {bullet: touching for bullet, touching in
+                ((projectile(key), touching) for key, touching in found.items())
+                if bullet.alive()}
+    
+    def _check_ship_collisions(self):
+        # Look for alien-ship collisions
+        if self.contacts['ship', 'aliens'] and not self.ship.exploding:
+            self._ship_hit()
     
     def _check_bullet_collisions(self):
         # Check for bullets that hit aliens
-        collisions = pygame.sprite.groupcollide(
-            self.bullets, self.aliens, True, False)
+        collisions = self._live_contacts(('bullets', 'aliens'))
         
         # Process alien hits
         if collisions:
             for bullet, aliens_hit in collisions.items():
-                for alien in aliens_hit:
+                bullet.kill()
+                for key in aliens_hit:
                     # Start alien explosion animation
+                    alien = self.aliens.alien(key)
                     alien.hit()
-                    self.explosion_sound.play()
+                    self.sounds.play('explosion')
                     
                     # Add points for each alien hit
                     self.stats.score += alien.point_value
@@ -383,15 +784,15 @@ class SpaceInvaders:
             self.sb.check_high_score()
         
         # Check for bullet-UFO collisions
-        if self.ufo and pygame.sprite.spritecollideany(self.ufo, self.bullets):
+        ufo_hits = self._live_contacts(('bullets', 'ufo'))
+        if self.ufo and ufo_hits:
             # Remove the bullet
-            for bullet in self.bullets:
-                if pygame.sprite.collide_rect(bullet, self.ufo):
-                    bullet.kill()
+            for bullet in ufo_hits:
+                bullet.kill()
             
             # Start UFO hit sequence
             self.ufo.hit()
-            self.explosion_sound.play()
+            self.sounds.play('explosion')
             
             # Add points
             self.stats.score += self.ufo.point_value
@@ -399,282 +800,236 @@ class SpaceInvaders:
             self.sb.check_high_score()
         
         # Check for bullet-barrier collisions
-        for barrier in self.barriers:
-            pygame.sprite.groupcollide(
-                self.bullets, barrier.pieces, True, False)
-            for piece, bullets_hit in pygame.sprite.groupcollide(
-                    barrier.pieces, self.bullets, False, True).items():
-                piece.hit()
+        for barrier, bullets in self._barrier_contacts('bullets').items():
+            barrier.block(bullets)
         
         # Check if all aliens have been destroyed
         if not self.aliens:
             # Destroy all bullets and create new fleet
-            self.bullets.empty()
-            self.alien_bullets.empty()
+            self.projectiles.empty()
             self._create_fleet()
             self.settings.increase_speed(len(self.aliens), self.initial_alien_count)
     
+    def _barrier_contacts(self, layer):
+        """{barrier: [bullets touching it]} for bullets still in play, barriers in order"""
+        touching = {}
+        for bullet, barriers in self._live_contacts((layer, 'barriers')).items():
+            for barrier in barriers:
+                touching.setdefault(barrier, []).append(bullet)
+        return {barrier: touching[barrier] for barrier in self.barriers if barrier in touching}
+    
     def _check_alien_bullet_collisions(self):
         # Check for alien bullets hitting the ship
-        if not self.ship.exploding and pygame.sprite.spritecollideany(self.ship, self.alien_bullets):
+        ship_hits = self._live_contacts(('alien_bullets', 'ship'))
+        if not self.ship.exploding and ship_hits:
             # Remove the bullet
-            for bullet in self.alien_bullets:
-                if pygame.sprite.collide_rect(bullet, self.ship):
-                    bullet.kill()
+            for bullet in ship_hits:
+                bullet.kill()
             
             # Handle ship hit
             self._ship_hit()
         
         # Check for alien bullets hitting barriers
-        for barrier in self.barriers:
-            for piece, bullets_hit in pygame.sprite.groupcollide(
-                    barrier.pieces, self.alien_bullets, False, True).items():
-                piece.hit()
+        for barrier, bullets in self._barrier_contacts('alien_bullets').items():
+            barrier.take_hits(bullets)
         
         # Check for bullet-bullet collisions (cancel each other out)
-        pygame.sprite.groupcollide(self.bullets, self.alien_bullets, True, True)
+        projectile = self.projectiles.projectile
+        for bullet, alien_bullets in self._live_contacts(('bullets', 'alien_bullets')).items():
+            alien_bullets = [projectile(key) for key in alien_bullets]
+            alien_bullets = [alien_bullet for alien_bullet in alien_bullets if alien_bullet.alive()]
+            if alien_bullets:
+                bullet.kill()
+                for alien_bullet in alien_bullets:
+                    alien_bullet.kill()
     
     def _create_button(self, text, position):
         button_color = (0, 255, 0)
         text_color = (255, 255, 255)
-        font = pygame.font.SysFont('Arial', 48)
         
         # Render the text
-        text_image = font.render(text, True, text_color)
+        px = self.settings.px
+        text_image = fonts.render(text, 'Arial', px(48), text_color)
         text_rect = text_image.get_rect()
         text_rect.topleft = position
         
         # Create button rectangle
-        button_rect = text_rect.inflate(40, 20)
+        button_rect = text_rect.inflate(px(40), px(20))
         
         return ((text_image, text_rect), button_rect)
 
     def _draw_launch_screen(self):
-        # Fill background with deep space black
-        self.screen.fill((0, 0, 0))
-
-        # Draw starfield effect
-        for _ in range(100):
-            x = random.randint(0, self.settings.screen_width)
-            y = random.randint(0, self.settings.screen_height)
-            size = random.randint(1, 3)
-            brightness = random.randint(150, 255)
-            pygame.draw.circle(self.screen, (brightness, brightness, brightness), (x, y), size)
-
-        # Draw scan lines effect (retro CRT look)
-        for y in range(0, self.settings.screen_height, 4):
-            pygame.draw.line(self.screen, (0, 0, 0), (0, y), (self.settings.screen_width, y), 1)
-
-        # Draw glowing classic logo - with more vertical spacing
-        title_font = pygame.font.SysFont('Courier New', 80, bold=True)
-        shadow_offset = 2
-
-        # Shadow for glow effect
-        for offset in range(1, 5):
-            glow_color = (0, min(50 + offset * 10, 255), min(50 + offset * 10, 255))
-            title_shadow = title_font.render("SPACE INVADERS", True, glow_color)
-            shadow_rect = title_shadow.get_rect(centerx=self.screen.get_rect().centerx, y=80 - offset)
-            self.screen.blit(title_shadow, shadow_rect)
-
-        # Main title with pixel-like appearance
-        title_text = title_font.render("SPACE INVADERS", True, (0, 255, 0))
-        title_rect = title_text.get_rect(centerx=self.screen.get_rect().centerx, y=80)
-        self.screen.blit(title_text, title_rect)
-
-        # Blinking "INSERT COIN" text - moved to bottom of screen
-        if pygame.time.get_ticks() % 1000 < 500:  # Blink every half second
-            coin_font = pygame.font.SysFont('Courier New', 24)
-            coin_text = coin_font.render("INSERT COIN", True, (255, 255, 0))
-            coin_rect = coin_text.get_rect(centerx=self.screen.get_rect().centerx, y=620)
-            self.screen.blit(coin_text, coin_rect)
-
-        # Pixelated border around the screen (arcade cabinet style)
-        border_width = 20
-        pygame.draw.rect(self.screen, (40, 40, 40), (0, 0, self.settings.screen_width, border_width))
-        pygame.draw.rect(self.screen, (40, 40, 40), (0, self.settings.screen_height - border_width,
-                                                     self.settings.screen_width, border_width))
-        pygame.draw.rect(self.screen, (40, 40, 40), (0, 0, border_width, self.settings.screen_height))
-        pygame.draw.rect(self.screen, (40, 40, 40), (self.settings.screen_width - border_width, 0,
-                                                     border_width, self.settings.screen_height))
-
-        # Draw retro-styled alien showcase with animated movement
-        value_font = pygame.font.SysFont('Courier New', 30)
-        time_factor = pygame.time.get_ticks() / 500  # For animation
-
-        # Keep all alien types - they're essential for gameplay instructions
-        sample_aliens = [
-            (RedAlien(self, 0, 0), "= 40 PTS", (255, 0, 0)),
-            (BlueAlien(self, 0, 0), "= 20 PTS", (0, 0, 255)),
-            (GreenAlien(self, 0, 0), "= 10 PTS", (0, 255, 0)),
-            (PinkAlien(self, 0, 0), "= 30 PTS", (255, 0, 255)),
-            (UFO(self), "= ???", (255, 255, 255))
-        ]
-
-        # Display each alien with retro-style point values - with significantly increased spacing
-        for i, (alien, value_str, color) in enumerate(sample_aliens):
-            # Position alien with minimal animation to prevent overlap
-            x_offset = math.sin(time_factor + i) * 3  # Very reduced animation
-            # Move aliens to left side for better spacing
-            x_pos = self.screen.get_rect().centerx - 250 + x_offset
-            y_pos = 170 + i * 50  # Tight but sufficient vertical spacing
-
-            # Draw pixel box around the alien
-            alien_box = pygame.Rect(x_pos - 10, y_pos - 5, 40, 40)
-            pygame.draw.rect(self.screen, (30, 30, 30), alien_box)
-            pygame.draw.rect(self.screen, color, alien_box, 1)
-
-            # Render alien
-            self.screen.blit(alien.image, (x_pos, y_pos))
-
-            # Render value text with retro styling - with more spacing
-            value_text = value_font.render(value_str, True, color)
-            self.screen.blit(value_text, (x_pos + 70, y_pos + 5))  # Moved text further right
-
-        # Create retro-styled buttons with pixel edges and glowing effect
-        play_button_text = "PLAY GAME"
-        high_scores_text = "HIGH SCORES"
-
-        button_width = 280
-        button_height = 50
-        button_color = (0, 0, 0)
-        button_border = (0, 255, 0)
-        text_color = (0, 255, 0)
-
-        button_font = pygame.font.SysFont('Courier New', 36)
-
-        # Position buttons even lower to avoid overlap with the additional aliens
-        # Play button with flashing effect when hovered
-        play_button_rect = pygame.Rect(self.screen.get_rect().centerx - button_width // 2,
-                                       460, button_width, button_height)  # Moved down further
-
-        # Check if mouse is over play button for hover effect
-        mouse_pos = pygame.mouse.get_pos()
-        play_hover = play_button_rect.collidepoint(mouse_pos)
-
-        # Draw play button with animated border if hovered
-        if play_hover and pygame.time.get_ticks() % 500 < 250:
-            pygame.draw.rect(self.screen, (0, 200, 0), play_button_rect.inflate(10, 10), 0)
-        pygame.draw.rect(self.screen, button_color, play_button_rect, 0)
-        pygame.draw.rect(self.screen, button_border, play_button_rect, 3)
-
-        # Draw pixelated corners for play button
-        corner_size = 8
-        for corner in [(0, 0), (button_width - corner_size, 0),
-                       (0, button_height - corner_size), (button_width - corner_size, button_height - corner_size)]:
-            pygame.draw.rect(self.screen, button_border,
-                             (play_button_rect.x + corner[0], play_button_rect.y + corner[1],
-                              corner_size, corner_size))
-
-        # Draw play button text
-        play_text = button_font.render(play_button_text, True, text_color)
-        self.screen.blit(play_text, play_text.get_rect(center=play_button_rect.center))
-
-        # High scores button - moved further down
-        scores_button_rect = pygame.Rect(self.screen.get_rect().centerx - button_width // 2,
-                                         520, button_width, button_height)  # More space between buttons
-
-        # Check if mouse is over high scores button
-        scores_hover = scores_button_rect.collidepoint(mouse_pos)
-
-        # Draw high scores button with animated border if hovered
-        if scores_hover and pygame.time.get_ticks() % 500 < 250:
-            pygame.draw.rect(self.screen, (0, 200, 0), scores_button_rect.inflate(10, 10), 0)
-        pygame.draw.rect(self.screen, button_color, scores_button_rect, 0)
-        pygame.draw.rect(self.screen, button_border, scores_button_rect, 3)
-
-        # Draw pixelated corners for high scores button
-        for corner in [(0, 0), (button_width - corner_size, 0),
-                       (0, button_height - corner_size), (button_width - corner_size, button_height - corner_size)]:
-            pygame.draw.rect(self.screen, button_border,
-                             (scores_button_rect.x + corner[0], scores_button_rect.y + corner[1],
-                              corner_size, corner_size))
-
-        # Draw high scores text
-        scores_text = button_font.render(high_scores_text, True, text_color)
-        self.screen.blit(scores_text, scores_text.get_rect(center=scores_button_rect.center))
-
-        # Update button hitboxes for interaction
-        self.play_button = ((play_text, play_text.get_rect(center=play_button_rect.center)), play_button_rect)
-        self.high_scores_button = (
-        (scores_text, scores_text.get_rect(center=scores_button_rect.center)), scores_button_rect)
-
-        # Draw retro copyright text
-        copyright_font = pygame.font.SysFont('Courier New', 16)
-        copyright_text = copyright_font.render("(C) 2025 ARCADE CLASSICS BY JARED+BRETT", True, (150, 150, 150))
-        self.screen.blit(copyright_text, (20, self.settings.screen_height - 30))
+        self.launch_screen.draw(pygame.time.get_ticks(), pygame.mouse.get_pos())
     
     def _draw_high_scores_screen(self):
         """Draw the high scores screen."""
+        px = self.settings.px
         # Fill background
         self.screen.fill(self.settings.bg_color)
         
         # Draw title
-        title_font = pygame.font.SysFont('Arial', 64)
-        title_text = title_font.render("HIGH SCORES", True, (255, 255, 255))
-        title_rect = title_text.get_rect(centerx=self.screen.get_rect().centerx, y=50)
+        title_text = fonts.render("HIGH SCORES", 'Arial', px(64), (255, 255, 255))
+        title_rect = title_text.get_rect(centerx=self.screen.get_rect().centerx, y=px(50))
         self.screen.blit(title_text, title_rect)
         
         # Draw scores
-        score_font = pygame.font.SysFont('Arial', 36)
-        
         for i, score_data in enumerate(self.stats.high_scores):
             name = score_data["name"]
             score = score_data["score"]
             
             # Format score text
             text = f"{i+1}. {name}: {score}"
-            score_text = score_font.render(text, True, (255, 255, 255))
+            score_text = fonts.render(text, 'Arial', px(36), (255, 255, 255))
             
             # Position text
             x_pos = self.screen.get_rect().centerx - score_text.get_width() // 2
-            y_pos = 150 + i * 40
+            y_pos = px(150) + i * px(40)
             
             # Draw text
             self.screen.blit(score_text, (x_pos, y_pos))
         
         # Draw back button
         (button_text, button_text_rect), button_rect = self.back_button
-        pygame.draw.rect(self.screen, (0, 255, 0), button_rect, 3)
+        pygame.draw.rect(self.screen, (0, 255, 0), button_rect, px(3))
         self.screen.blit(button_text, button_text_rect)
     
-    def _update_screen(self):
+    def _update_screen(self, alpha=1.0):
         if self.current_screen == "launch":
             self._draw_launch_screen()
         elif self.current_screen == "high_scores":
             self._draw_high_scores_screen()
         elif self.current_screen == "game":
-            # Background
-            self.screen.fill(self.settings.bg_color)
-            
-            # Draw ship
-            self.ship.blitme()
-            
-            # Draw bullets
-            for bullet in self.bullets.sprites():
-                bullet.draw_bullet()
-            
-            for bullet in self.alien_bullets.sprites():
-                bullet.draw_bullet()
-            
-            # Draw aliens
-            self.aliens.draw(self.screen)
-            
-            # Draw UFO if active
-            if self.ufo:
-                self.screen.blit(self.ufo.image, self.ufo.rect)
-            
-            # Draw barriers
-            for barrier in self.barriers:
-                barrier.draw()
-            
-            # Draw the score information
-            self.sb.show_score()
+            self._draw_game(alpha)
+            return
         
+        # Menus redraw the whole screen, so start over when gameplay resumes
+        self.dirty.invalidate()
         # Make the most recently drawn screen visible
         pygame.display.flip()
+    
+    def _draw_game(self, alpha):
+        """draw the gameplay screen, all of it or only what changed"""
+        dirty = self.settings.dirty_rendering
+        # Background
+        if dirty:
+            self.dirty.begin()
+        else:
+            self.screen.fill(self.settings.bg_color)
+        
+        queue = self.render_queue
+        # Draw ship
+        self.ship.blitme(queue, self._render_rect(self.ship, alpha))
+        
+        # Draw bullets
+        self.projectiles.draw_projectiles(queue, alpha)
+        
+        # Draw aliens
+        self.aliens.draw_fleet(queue, alpha)
+        
+        # Draw UFO if active
+        if self.ufo:
+            queue.blit('ufo', self.ufo.image, self._render_rect(self.ufo, alpha))
+        
+        # Draw barriers
+        for barrier in self.barriers:
+            barrier.draw(queue)
+        
+        # Draw the score information
+        self.sb.show_score(queue)
+        
+        # Frame timings, when F3 has turned them on
+        self.profiler.draw_overlay(queue)
+        
+        # Everything queued, in one batch
+        drawn = queue.submit(rects=dirty)
+        self.profiler.count('draw_calls', queue.draw_calls)
+        self.profiler.count('draw_batches', queue.batches)
+        
+        # Make the most recently drawn screen visible
+        if dirty:
+            self.dirty.present(drawn)
+        else:
+            self.dirty.invalidate()
+            pygame.display.flip()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Space Invaders")
+    parser.add_argument('--headless', action='store_true',
+                        help="simulate without a window or audio, as fast as possible")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for the simulation")
+    parser.add_argument('--frames', type=int, default=3600, help="frames to simulate")
+    parser.add_argument('--render-every', type=int, default=0, metavar='N',
+                        help="draw every Nth frame (default: never)")
+    parser.add_argument('--tick-rate', type=int, default=60,
+                        help="simulation ticks per second (default: 60)")
+    parser.add_argument('--input', default='bot',
+                        help="'bot', 'random', 'none' or the path of an input script")
+    parser.add_argument('--record', metavar='PATH',
+                        help="record each game's inputs to PATH ({seed} is replaced by the seed)")
+    parser.add_argument('--replay', metavar='PATH', help="play back a recorded game")
+    parser.add_argument('--speed', type=float, default=1.0, help="replay playback speed")
+    parser.add_argument('--seek', type=int, default=0, metavar='TICK',
+                        help="fast-forward the replay to this tick before showing it")
+    parser.add_argument('--fleet-engine', choices=('sprites', 'numpy'), default='sprites',
+                        help="store the alien fleet as sprites or as NumPy arrays")
+    parser.add_argument('--projectile-engine', choices=('sprites', 'numpy'), default='sprites',
+                        help="store bullets as sprites or as NumPy arrays")
+    parser.add_argument('--dirty-rendering', action='store_true',
+                        help="redraw and present only the parts of the game screen that change")
+    parser.add_argument('--pixel-size', type=int, default=1, metavar='N',
+                        help="draw at 1/N resolution and let SDL scale it up (replays keep "
+                             "their own)")
+    parser.add_argument('--fullscreen', action='store_true',
+                        help="scale the screen up to the whole display")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="write per-phase frame timings as a Chrome trace to PATH on exit")
+    args = parser.parse_args(argv)
+    if args.tick_rate not in TICK_RATES:
+        parser.error(f"--tick-rate must be from {TICK_RATES.start} to {TICK_RATES.stop - 1}")
+    if args.pixel_size not in PIXEL_SIZES:
+        parser.error(f"--pixel-size must be from {PIXEL_SIZES.start} to {PIXEL_SIZES.stop - 1}")
+    return args
+
+
+def _apply_cli_options(game, args):
+    """apply the command line options every kind of run shares"""
+    game.profile_path = args.profile
+    game.settings.fleet_engine = args.fleet_engine
+    game.settings.projectile_engine = args.projectile_engine
+    game.settings.dirty_rendering = args.dirty_rendering
 
 
 if __name__ == "__main__":
-    # Make a game instance, and run the game
-    game = SpaceInvaders()
-    game.run_game()
+    args = parse_args()
+    # A replay plays back at the pixel size it was recorded at
+    replay = Replay.load(args.replay) if args.replay else None
+    pixel_size = replay.pixel_size if replay else args.pixel_size
+    if args.headless:
+        game = SpaceInvaders(headless=True, render_every=args.render_every,
+                             pixel_size=pixel_size)
+    else:
+        game = SpaceInvaders(pixel_size=pixel_size, fullscreen=args.fullscreen)
+    _apply_cli_options(game, args)
+    
+    if replay and args.headless:
+        # Re-simulate a recorded game and check its score
+        game.settings.set_tick_rate(replay.tick_rate)
+        summary = game.run_headless(len(replay), replay.controller(), replay.seed)
+        summary['claimed_score'] = replay.score
+        summary['verified'] = summary['score'] == replay.score
+        print(json.dumps(summary))
+    elif replay:
+        # Watch a recorded game
+        game.play_replay(replay, args.speed, args.seek)
+    elif args.headless:
+        # Simulate a game and print a summary
+        game.settings.set_tick_rate(args.tick_rate)
+        game.record_path = args.record
+        summary = game.run_headless(args.frames, make_controller(args.input, args.seed), args.seed)
+        print(json.dumps(summary))
+    else:
+        # Play the game
+        game.settings.set_tick_rate(args.tick_rate)
+        game.record_path = args.record
+        game.run_game()
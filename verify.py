@@ -0,0 +1,129 @@
+"""Re-simulate recorded games to confirm or reject their claimed scores.
+
+    python verify.py replays/*.rep --workers 8 --output results.json
+
+Each replay is played back headlessly in a process pool (one worker per
+core by default) and its final score compared with the score it claims.
+"""
+import argparse
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from replay import Replay
+
+# One headless game per worker process, reused for every replay it checks
+_game = None
+
+
+def _init_worker():
+    global _game
+    _game = _new_game(1)
+
+
+def _new_game(pixel_size):
+    # The game module's file name has a dash, so import it by name
+    SpaceInvaders = importlib.import_module('space-invaders').SpaceInvaders
+    return SpaceInvaders(headless=True, pixel_size=pixel_size)
+
+
+def _game_for(replay):
+    """the worker's game, rebuilt if the replay was recorded at another pixel size
+
+    Images are loaded at one pixel size at a time (see assets.set_pixel_size),
+    so only one game is kept.
+    """
+    global _game
+    if _game is None or _game.settings.pixel_size != replay.pixel_size:
+        _game = None
+        _game = _new_game(replay.pixel_size)
+    return _game
+
+
+def verify_session(session):
+    """re-simulate one (session id, replay bytes) pair
+
+    A session that can't be read or played back is rejected, so one bad
+    upload never stops the rest of the batch.
+    """
+    global _game
+    session_id, data = session
+    try:
+        replay = Replay.from_bytes(data)
+    except ValueError as e:
+        return {'session': session_id, 'verified': False, 'error': str(e), 'frames': 0}
+
+    try:
+        game = _game_for(replay)
+        game.settings.set_tick_rate(replay.tick_rate)
+        summary = game.run_headless(len(replay), replay.controller(), replay.seed)
+    except Exception as e:
+        # The game may be left half-way through a tick, so start the next one afresh
+        _game = None
+        return {'session': session_id, 'verified': False,
+                'error': f"{type(e).__name__}: {e}", 'frames': 0}
+    return {
+        'session': session_id,
+        'verified': summary['score'] == replay.score,
+        'claimed_score': replay.score,
+        'score': summary['score'],
+        'frames': summary['frames'],
+    }
+
+
+def verify_sessions(sessions, workers=None):
+    """verify a batch of sessions in parallel, returning (results, report)"""
+    workers = workers or os.cpu_count() or 1
+    # Hand each worker a few large chunks rather than thousands of tiny tasks
+    chunksize = max(1, len(sessions) // (workers * 4))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        results = list(pool.map(verify_session, sessions, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    frames = sum(result['frames'] for result in results)
+    report = {
+        'sessions': len(results),
+        'verified': sum(result['verified'] for result in results),
+        'rejected': sum(not result['verified'] for result in results),
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'simulated_frames': frames,
+        'simulated_fps': round(frames / elapsed, 1) if elapsed else None,
+    }
+    return results, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify recorded Space Invaders scores")
+    parser.add_argument('replays', nargs='+', help="replay files to verify")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument('--output', metavar='PATH', help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    sessions = []
+    for path in args.replays:
+        with open(path, 'rb') as f:
+            sessions.append((path, f.read()))
+
+    results, report = verify_sessions(sessions, args.workers)
+    for result in results:
+        if 'error' in result:
+            print(f"REJECTED  {result['session']}: {result['error']}")
+            continue
+        status = "OK" if result['verified'] else "REJECTED"
+        print(f"{status:9} {result['session']}: claimed {result['claimed_score']}, "
+              f"got {result['score']}")
+    print(json.dumps(report))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'report': report, 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()